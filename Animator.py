@@ -0,0 +1,95 @@
+from time import perf_counter
+from tkinter import Misc, TclError
+
+
+class Animator:
+    """
+    Animator class that runs GUI animations on the Tkinter event loop with after() instead of blocking loops.
+    Each animation is a tween: a step function called with progress from 0 to 1 at a capped frame rate. Progress
+    follows elapsed time, so frames that cannot be rendered in time are skipped instead of slowing the animation.
+    Starting an animation under a key that is already animating cancels the running one.
+    """
+
+    def __init__(self, widget: Misc, fps: int = 60):
+        """
+        Class constructor.
+
+        :param widget: Tkinter widget used for scheduling (ex. root window)
+        :param fps: maximum frames per second
+        """
+        self.widget = widget
+        self.frameTime = 1 / fps
+        self.animations = dict()  # {key: [step, done, duration, start time, after id]}
+
+    def play(self, key, step, duration: float = 0.4, done=None) -> None:
+        """
+        Starts animation, replacing running animation of same key.
+        Animations with no duration draw their last frame right away.
+
+        :param key: animation key (ex. name of animated canvas)
+        :param step: callable drawing frame at given progress in [0, 1]
+        :param duration: animation length in seconds
+        :param done: callable run after last frame, optional
+        :return: None
+        """
+        self.cancel(key)
+        if duration <= 0:
+            step(1.0)
+            if done is not None:
+                done()
+            return
+
+        self.animations[key] = [step, done, duration, perf_counter(), None]
+        self.__frame(key)
+
+    def cancel(self, key) -> None:
+        """
+        Stops animation of given key where it is, if running.
+
+        :param key: animation key
+        :return: None
+        """
+        animation = self.animations.pop(key, None)
+        if animation is not None and animation[4] is not None:
+            self.widget.after_cancel(animation[4])
+
+    def cancelAll(self) -> None:
+        """
+        Stops all running animations.
+
+        :return: None
+        """
+        for key in list(self.animations):
+            self.cancel(key)
+
+    def __frame(self, key) -> None:
+        """
+        Sub method for self.play() method.
+        Draws one frame of animation at its current progress & schedules the next frame.
+
+        :param key: animation key
+        :return: None
+        """
+        animation = self.animations.get(key)
+        if animation is None:
+            return
+        [step, done, duration, start, _] = animation
+
+        frame_start = perf_counter()
+        progress = min((frame_start - start) / duration, 1.0)
+        try:
+            step(progress)
+        except TclError:
+            # animated widget was destroyed (ex. closed Toplevel)
+            self.animations.pop(key, None)
+            return
+
+        if progress >= 1.0:
+            self.animations.pop(key, None)
+            if done is not None:
+                done()
+            return
+
+        # wait for the rest of the frame, at least 1 ms so pending events are handled in between
+        delay = self.frameTime - (perf_counter() - frame_start)
+        animation[4] = self.widget.after(max(1, int(delay * 1000)), self.__frame, key)
@@ -0,0 +1,176 @@
+import requests
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+
+class ContentCollector:
+    """
+    ContentCollector class used as lxml parser target, collecting text of all paragraphs inside the first element
+    with the given id as the page is parsed, without building a document tree.
+    """
+
+    def __init__(self, contentId: str):
+        """
+        Class constructor.
+
+        :param contentId: id of the html element holding the article's main content
+        """
+        self.contentId = contentId
+        self.contentDepth = 0  # open elements inside (& including) main content element, 0 outside
+        self.paragraphDepth = 0  # open elements inside (& including) current paragraph, 0 outside
+        self.done = False  # True once main content element is closed
+        self.parts = []
+
+    def start(self, tag: str, attrib: dict) -> None:
+        """
+        Parser event for an opening tag.
+
+        :param tag: tag name
+        :param attrib: tag attributes
+        :return: None
+        """
+        if self.done:
+            return
+        if self.contentDepth == 0:
+            if tag == 'div' and attrib.get('id') == self.contentId:
+                self.contentDepth = 1
+            return
+        self.contentDepth += 1
+        if self.paragraphDepth > 0:
+            self.paragraphDepth += 1
+        elif tag == 'p':
+            self.paragraphDepth = 1
+
+    def end(self, tag: str) -> None:
+        """
+        Parser event for a closing tag.
+
+        :param tag: tag name
+        :return: None
+        """
+        if self.done or self.contentDepth == 0:
+            return
+        self.contentDepth -= 1
+        self.done = self.contentDepth == 0
+        if self.paragraphDepth > 0:
+            self.paragraphDepth -= 1
+            if self.paragraphDepth == 0:
+                self.parts.append(" ")
+
+    def data(self, data: str) -> None:
+        """
+        Parser event for text.
+
+        :param data: text
+        :return: None
+        """
+        if self.paragraphDepth > 0:
+            self.parts.append(data)
+
+    def close(self) -> str:
+        """
+        Parser event for the end of the page.
+
+        :return: collected paragraph text, each paragraph followed by a space
+        """
+        return "".join(self.parts)
+
+
+class ArticleFetcher:
+    """
+    ArticleFetcher class that extracts server-rendered article text over plain HTTP, without a browser.
+    Uses one pooled keep-alive session shared by all worker threads.
+    """
+
+    CHUNK_SIZE = 16384  # characters fed to the parser at a time
+
+    def __init__(self, size: int = 16, timeout: float = 10, contentId: str = "maincontent"):
+        """
+        Class constructor.
+
+        :param size: number of worker threads & pooled connections per host
+        :param timeout: request timeout (seconds)
+        :param contentId: id of the html element holding the article's main content
+        """
+        self.timeout = timeout
+        self.contentId = contentId
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "Mozilla/5.0 (compatible; StockProject)"
+        adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="fetch")
+
+    def extractText(self, html: bytes | str, encoding: str = None) -> str | None:
+        """
+        Extracts text of all paragraphs inside the main content element.
+        The page is parsed as a stream without building a document tree, and parsing stops once the main content
+        element is closed.
+
+        :param html: article page html
+        :param encoding: encoding of html bytes, None to read it from the page's <meta charset>
+        :return: Extracted text, None if page has no main content text
+        """
+        collector = ContentCollector(self.contentId)
+        parser = etree.HTMLParser(target=collector, encoding=encoding if isinstance(html, bytes) else None)
+        try:
+            for k in range(0, len(html), self.CHUNK_SIZE):
+                parser.feed(html[k:k + self.CHUNK_SIZE])
+                if collector.done:
+                    break
+            article_text = parser.close()
+        except (etree.LxmlError, ValueError):
+            return None
+        return article_text if article_text.strip() else None
+
+    def fetch(self, articleURL: str) -> str | None:
+        """
+        Downloads given article over HTTP & extracts its text.
+
+        :param articleURL: Given article link
+        :return: Extracted text, None if download failed or page has no main content text
+        """
+        try:
+            response = self.session.get(articleURL, timeout=self.timeout)
+        except requests.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        return self.extractText(response.content, self.__encoding(response))
+
+    @staticmethod
+    def __encoding(response: requests.Response) -> str | None:
+        """
+        Helper method for self.fetch() method.
+        Finds encoding of downloaded page like a browser: charset of the Content-Type header first, then a charset
+        declared within the page's first 1024 bytes, and otherwise the encoding detected from its content.
+
+        :param response: HTTP response of article page
+        :return: encoding, None if declared by the page itself
+        """
+        if "charset" in response.headers.get("Content-Type", "").lower():
+            return response.encoding
+        if b"charset" in response.content[:1024].lower():
+            return None
+        return response.apparent_encoding
+
+    def fetchAll(self, articleURLs: list):
+        """
+        Downloads & extracts all given articles concurrently.
+
+        :param articleURLs: list of article links
+        :return: iterator of (article link, extracted text or None)
+        """
+        return zip(articleURLs, self.executor.map(self.fetch, articleURLs))
+
+    def close(self) -> None:
+        """
+        Shuts down worker threads & closes pooled connections.
+
+        :return: None
+        """
+        self.executor.shutdown(wait=True)
+        self.session.close()
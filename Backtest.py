@@ -0,0 +1,211 @@
+from PredictionEngine import PredictionEngine
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+# worker process state, set once per process by _initWorker
+_workerData = None
+
+
+def _initWorker(changes: np.ndarray, pastMean: np.ndarray, pastStd: np.ndarray, relations: np.ndarray) -> None:
+    """
+    Process pool initializer.
+    Keeps backtest arrays in worker process, so tasks only send their parameters.
+
+    :param changes: (step x stock) price changes
+    :param pastMean: (step x stock) mean of all earlier changes
+    :param pastStd: (step x stock) standard deviation of all earlier changes
+    :param relations: (stock x stock) normalized relation values
+    :return: None
+    """
+    global _workerData
+    _workerData = (changes, pastMean, pastStd, relations)
+
+
+def _evaluateShard(relationCutoff: float, sigma: float, start: int, end: int) -> np.ndarray:
+    """
+    Process pool task.
+    Evaluates predictions of steps [start, end) for given parameters.
+
+    :param relationCutoff: minimum normalized relation value of influencing stocks
+    :param sigma: number of standard deviations a change must exceed to be significant
+    :param start: first step of shard
+    :param end: step after last step of shard
+    :return: per stock sums (see Backtest.evaluate() method)
+    """
+    return Backtest.evaluate(*_workerData, relationCutoff, sigma, start, end)
+
+
+class Backtest:
+    """
+    Backtest class that replays stored price history to measure how well the relation-based prediction would have
+    done (see PredictionEngine.py).
+    Walk-forward: at every step, change importance only uses the changes before it, and each prediction is compared
+    against the following change. All stocks & steps are evaluated at once with array operations; parameter
+    combinations & step shards can run over a process pool.
+    """
+
+    def __init__(self, prices: np.ndarray, relations: np.ndarray, tickers: list, warmup: int = 20,
+                 halfLife: float = None):
+        """
+        Class constructor.
+        Calculates price changes & their past statistics for every step.
+
+        :param prices: (bar x stock) price history, NaN for missing bars
+        :param relations: (stock x stock) relation values (see RelationStore.py)
+        :param tickers: stock symbols in column order
+        :param warmup: number of changes before the first evaluated step
+        :param halfLife: half-life of change statistics in changes, None to weight all past changes equally
+        """
+        self.tickers = tickers
+        self.warmup = max(warmup, 2)
+
+        self.changes = np.diff(np.asarray(prices, dtype=np.float64), axis=0)
+        self.pastMean, self.pastStd = self.pastStatistics(self.changes, halfLife)
+        self.relations = PredictionEngine(relations).relations
+
+    @staticmethod
+    def priceMatrix(frames: dict, tickers: list) -> np.ndarray:
+        """
+        Aligns mid-prices of given price bars on their common bar times.
+
+        :param frames: {ticker: OHLCV DataFrame}
+        :param tickers: stock symbols in column order
+        :return: (bar x stock) mid-prices, forward filled, NaN before a stock's first bar
+        """
+        mids = {ticker: (frames[ticker]['High'] + frames[ticker]['Low']) / 2 for ticker in tickers if ticker in frames}
+        return pd.DataFrame(mids).reindex(columns=tickers).sort_index().ffill().to_numpy(dtype=np.float64)
+
+    @staticmethod
+    def pastStatistics(changes: np.ndarray, halfLife: float = None) -> tuple:
+        """
+        Calculates mean & standard deviation of all changes before every step, per stock.
+        Matches the running statistics used for change importance (see RunningStats.py).
+
+        :param changes: (step x stock) price changes
+        :param halfLife: half-life of change statistics in changes, None to weight all past changes equally
+        :return: ((step x stock) past mean, (step x stock) past standard deviation), NaN with less than two changes
+        """
+        changes_df = pd.DataFrame(changes)
+        if halfLife is None:
+            mean = changes_df.expanding(min_periods=2).mean()
+            std = changes_df.expanding(min_periods=2).std(ddof=1)
+        else:
+            ewm = changes_df.ewm(halflife=halfLife, adjust=False, ignore_na=True, min_periods=2)
+            mean = ewm.mean()
+            std = ewm.std(bias=True)
+        return mean.shift(1).to_numpy(dtype=np.float64), std.shift(1).to_numpy(dtype=np.float64)
+
+    @staticmethod
+    def evaluate(changes: np.ndarray, pastMean: np.ndarray, pastStd: np.ndarray, relations: np.ndarray,
+                 relationCutoff: float, sigma: float, start: int, end: int) -> np.ndarray:
+        """
+        Predicts every stock's next change at steps [start, end) & compares predictions with actual changes.
+
+        :param changes: (step x stock) price changes
+        :param pastMean: (step x stock) mean of all earlier changes
+        :param pastStd: (step x stock) standard deviation of all earlier changes
+        :param relations: (stock x stock) normalized relation values
+        :param relationCutoff: minimum normalized relation value of influencing stocks
+        :param sigma: number of standard deviations a change must exceed to be significant
+        :param start: first step
+        :param end: step after last step
+        :return: (6 x stock) sums of [evaluated steps, prediction hits, own change hits, absolute error,
+                 squared error, absolute error of own change]
+        """
+        end = min(end, len(changes) - 1)
+        current = changes[start: end]
+        actual = changes[start + 1: end + 1]
+
+        with np.errstate(invalid='ignore'):
+            importance = np.abs(current - pastMean[start: end]) > sigma * pastStd[start: end]
+        influence = np.where(relations >= relationCutoff, relations, 0)
+        prediction = current + np.where(importance, np.nan_to_num(current), 0) @ influence.T
+
+        valid = ~np.isnan(prediction) & ~np.isnan(actual)
+        error = np.where(valid, prediction - actual, 0)
+        return np.stack([
+            valid.sum(axis=0),
+            (valid & (np.sign(prediction) == np.sign(actual))).sum(axis=0),
+            (valid & (np.sign(current) == np.sign(actual))).sum(axis=0),
+            np.abs(error).sum(axis=0),
+            (error ** 2).sum(axis=0),
+            np.where(valid, np.abs(current - actual), 0).sum(axis=0)
+        ]).astype(np.float64)
+
+    def run(self, relationCutoff: float = 0.0, sigma: float = 1.0) -> dict:
+        """
+        Backtests prediction with given parameters in this process.
+
+        :param relationCutoff: minimum normalized relation value of influencing stocks (0 includes all stocks)
+        :param sigma: number of standard deviations a change must exceed to be significant
+        :return: backtest report (see self.report() method)
+        """
+        sums = self.evaluate(self.changes, self.pastMean, self.pastStd, self.relations, relationCutoff, sigma,
+                             self.warmup, len(self.changes))
+        return self.report(sums, relationCutoff, sigma)
+
+    def grid(self, relationCutoffs: list, sigmas: list, processes: int = None, shards_per_process: int = 4) -> list:
+        """
+        Backtests prediction with every combination of given parameters over a process pool.
+        Each combination is split into step shards, whose sums are combined into one report.
+
+        :param relationCutoffs: minimum normalized relation values of influencing stocks
+        :param sigmas: numbers of standard deviations a change must exceed to be significant
+        :param processes: number of worker processes (defaults to CPU count)
+        :param shards_per_process: number of step shards per worker process, for load balancing
+        :return: [backtest report, ...] per (relation cutoff, sigma) combination, sorted by highest hit rate
+        """
+        processes = processes or os.cpu_count() or 1
+        shard_cnt = max(1, min(len(self.changes) - self.warmup, processes * shards_per_process))
+        bounds = np.linspace(self.warmup, len(self.changes), shard_cnt + 1).astype(int)
+        shards = [(int(bounds[k]), int(bounds[k + 1])) for k in range(shard_cnt) if bounds[k] < bounds[k + 1]]
+        combinations = [(cutoff, sigma) for cutoff in relationCutoffs for sigma in sigmas]
+
+        with ProcessPoolExecutor(
+                max_workers=processes, initializer=_initWorker,
+                initargs=(self.changes, self.pastMean, self.pastStd, self.relations)) as executor:
+            futures = [[executor.submit(_evaluateShard, cutoff, sigma, start, end) for (start, end) in shards]
+                       for (cutoff, sigma) in combinations]
+            reports = [self.report(sum([future.result() for future in shard_futures]), cutoff, sigma)
+                       for (cutoff, sigma), shard_futures in zip(combinations, futures)]
+
+        return sorted(reports, key=lambda report: report['hitRate'], reverse=True)
+
+    def report(self, sums: np.ndarray, relationCutoff: float, sigma: float) -> dict:
+        """
+        Sub method for self.run() and self.grid() methods.
+        Summarizes evaluated sums into overall & per ticker statistics.
+
+        :param sums: (6 x stock) sums (see self.evaluate() method)
+        :param relationCutoff: relation cutoff of evaluated predictions
+        :param sigma: significance sigma of evaluated predictions
+        :return: {'relationCutoff', 'sigma', 'steps', 'hitRate', 'baselineHitRate', 'mae', 'rmse', 'baselineMae',
+                  'tickers': {ticker: {'steps', 'hitRate', 'baselineHitRate', 'mae', 'rmse'}}}
+                 where baseline is predicting each stock's own most recent change
+        """
+        [steps, hits, base_hits, abs_err, sq_err, base_abs_err] = sums
+        total = max(steps.sum(), 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tickers = {
+                self.tickers[i]: {
+                    'steps': int(steps[i]),
+                    'hitRate': float(hits[i] / steps[i]),
+                    'baselineHitRate': float(base_hits[i] / steps[i]),
+                    'mae': float(abs_err[i] / steps[i]),
+                    'rmse': float(np.sqrt(sq_err[i] / steps[i]))
+                } for i in range(len(self.tickers))}
+
+        return {
+            'relationCutoff': relationCutoff,
+            'sigma': sigma,
+            'steps': int(steps.sum()),
+            'hitRate': float(hits.sum() / total),
+            'baselineHitRate': float(base_hits.sum() / total),
+            'mae': float(abs_err.sum() / total),
+            'rmse': float(np.sqrt(sq_err.sum() / total)),
+            'baselineMae': float(base_abs_err.sum() / total),
+            'tickers': tickers
+        }
@@ -0,0 +1,36 @@
+from System import System
+
+import argparse
+
+if __name__ == "__main__":
+    # headless batch run: never imports the GUI (tkinter/matplotlib)
+    parser = argparse.ArgumentParser(description="Runs stock predictions & writes results of every stock to files.")
+    parser.add_argument("--output", default="output", help="output directory")
+    parser.add_argument("--format", default="csv", choices=["csv", "json", "parquet"], help="output file format")
+    parser.add_argument("--relations", action="store_true", help="run company relation analysis first")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes for relation analysis")
+    parser.add_argument("--offline", action="store_true", help="serve stock data from the local price cache only")
+    args = parser.parse_args()
+
+    system = System(offline=args.offline)
+
+    # -- adding stocks to system --
+    with open("company_names.txt") as f:
+        contents = f.readlines()
+
+    for line in contents:
+        line_split = line.split(", ")
+        if line_split[1][-1] == '\n':
+            line_split[1] = line_split[1][:-1]
+        system.addStock(line_split[0], line_split[1])
+
+    # -- running company relation analysis --
+    if args.relations:
+        system.runAllRelAnalysis(args.processes)
+
+    # -- retrieving stock data & running predictions --
+    system.runAllPredictAnalysis()
+
+    # -- writing results --
+    for path in system.writeReports(args.output, args.format):
+        print(f"Wrote {path}")
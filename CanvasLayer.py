@@ -0,0 +1,76 @@
+from tkinter import Canvas
+
+
+class CanvasLayer:
+    """
+    CanvasLayer class for retained-mode drawing on a Tkinter canvas.
+    Items are addressed by key and created once; drawing a key again only moves (coords()) or restyles
+    (itemconfig()) its existing item when its coordinates or options changed. Items not drawn between begin() and
+    end() are hidden, to be shown again when drawn next.
+    """
+
+    def __init__(self, canvas: Canvas):
+        """
+        Class constructor.
+
+        :param canvas: Tkinter canvas to draw on
+        """
+        self.canvas = canvas
+        self.items = dict()  # {key: [item id, coordinates, options, visible]}
+        self.drawn = None  # keys drawn since self.begin(), None outside of begin()/end()
+
+    def draw(self, key, kind: str, coords, **options) -> int:
+        """
+        Draws item under given key, creating it on first use.
+
+        :param key: hashable item key (ex. ("box", stock index))
+        :param kind: canvas item type, 'line', 'oval', 'rectangle', 'text', ...
+        :param coords: flat item coordinates [x1, y1, x2, y2, ...]
+        :param options: item options (fill, width, text, ...); tags are only applied on creation
+        :return: canvas item id
+        """
+        coords = tuple(float(value) for value in coords)
+        if self.drawn is not None:
+            self.drawn.add(key)
+
+        item = self.items.get(key)
+        if item is None:
+            item_id = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+            options.pop('tags', None)
+            self.items[key] = [item_id, coords, options, True]
+            return item_id
+
+        [item_id, old_coords, old_options, visible] = item
+        if coords != old_coords:
+            self.canvas.coords(item_id, *coords)
+            item[1] = coords
+        options.pop('tags', None)
+        changed = {name: value for (name, value) in options.items() if old_options.get(name) != value}
+        if not visible:
+            changed['state'] = 'normal'
+            item[3] = True
+        if changed:
+            self.canvas.itemconfig(item_id, **changed)
+            old_options.update(options)
+        return item_id
+
+    def begin(self) -> None:
+        """
+        Starts drawing pass, tracking which items are drawn.
+
+        :return: None
+        """
+        self.drawn = set()
+
+    def end(self) -> None:
+        """
+        Ends drawing pass, hiding every item that was not drawn since self.begin().
+
+        :return: None
+        """
+        for key in self.items.keys() - self.drawn:
+            item = self.items[key]
+            if item[3]:
+                self.canvas.itemconfig(item[0], state='hidden')
+                item[3] = False
+        self.drawn = None
@@ -0,0 +1,83 @@
+from collections import deque
+
+
+class CompanyTagger:
+    """
+    CompanyTagger class that finds every tracked company mentioned in a text in a single pass (Aho-Corasick).
+    Matches are case-sensitive and must start & end on word boundaries, so "Meta" does not match "Metaverse".
+    """
+
+    def __init__(self, companyNames: list):
+        """
+        Class constructor.
+        Builds Aho-Corasick automaton over all company names. Hyphenated names (ex. Home-Depot) also match
+        their spaced form (Home Depot).
+
+        :param companyNames: list of tracked company names
+        """
+        self.goto = [dict()]  # [{char: state}, ...]
+        self.fail = [0]  # [state, ...]
+        self.output = [[]]  # [[(company name, pattern length), ...], ...]
+
+        for name in companyNames:
+            for pattern in dict.fromkeys([name, name.replace("-", " ")]):
+                self.__addPattern(pattern, name)
+        self.__buildFailLinks()
+
+    def __addPattern(self, pattern: str, name: str) -> None:
+        """
+        Helper method for constructor.
+        Adds pattern to automaton trie.
+
+        :param pattern: text to match
+        :param name: company name reported for pattern
+        :return: None
+        """
+        state = 0
+        for char in pattern:
+            if char not in self.goto[state]:
+                self.goto.append(dict())
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.output[state].append((name, len(pattern)))
+
+    def __buildFailLinks(self) -> None:
+        """
+        Helper method for constructor.
+        Sets failure link of every trie state with breadth-first search, merging outputs along failure links.
+
+        :return: None
+        """
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def tag(self, text: str) -> set:
+        """
+        Finds all tracked companies mentioned in given text.
+
+        :param text: article text
+        :return: set of mentioned company names
+        """
+        found = set()
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+
+            for (name, length) in self.output[state]:
+                start = end - length + 1
+                if (start == 0 or not text[start - 1].isalnum()) and \
+                        (end + 1 == len(text) or not text[end + 1].isalnum()):
+                    found.add(name)
+        return found
@@ -0,0 +1,95 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+
+
+class CrawlPool:
+    """
+    CrawlPool class that fetches web pages concurrently over a pool of headless webdrivers.
+    Each worker thread owns one webdriver, created on its first fetch.
+    """
+
+    def __init__(self, size: int = 4, driverFactory=None, wait: int = 10):
+        """
+        Class constructor.
+
+        :param size: number of worker threads (and webdrivers)
+        :param driverFactory: function returning a new webdriver, defaults to headless Chrome
+        :param wait: implicit wait (seconds) set on every new webdriver
+        """
+        self.size = size
+        self.driverFactory = driverFactory if driverFactory is not None else self.headlessChrome
+        self.wait = wait
+
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="crawl")
+        self.local = threading.local()
+        self.drivers = []
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def headlessChrome():
+        """
+        Default webdriver factory.
+        Uses a separately downloaded chromedriver.exe if present, otherwise Selenium Manager finds a matching driver.
+
+        :return: headless Chrome webdriver
+        """
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        service = Service("chromedriver.exe") if os.path.exists("chromedriver.exe") else Service()
+        return webdriver.Chrome(service=service, options=options)
+
+    def __driver(self):
+        """
+        Helper method for self.fetch() method.
+        Returns webdriver owned by current worker thread, creating it on first use.
+
+        :return: webdriver
+        """
+        driver = getattr(self.local, 'driver', None)
+        if driver is None:
+            driver = self.driverFactory()
+            driver.implicitly_wait(self.wait)
+            self.local.driver = driver
+            with self.lock:
+                self.drivers.append(driver)
+        return driver
+
+    def fetch(self, url: str) -> str | None:
+        """
+        Loads given page with current worker thread's webdriver.
+
+        :param url: page URL
+        :return: page html, None if page could not be loaded
+        """
+        driver = self.__driver()
+        try:
+            driver.get(url)
+            return driver.page_source
+        except WebDriverException:
+            return None
+
+    def fetchAll(self, urls: list):
+        """
+        Loads all given pages concurrently.
+        Results are yielded in the given order to the calling thread, which stays the only one touching the database.
+
+        :param urls: list of page URLs
+        :return: iterator of (url, page html or None)
+        """
+        return zip(urls, self.executor.map(self.fetch, urls))
+
+    def close(self) -> None:
+        """
+        Shuts down worker threads and quits all webdrivers.
+
+        :return: None
+        """
+        self.executor.shutdown(wait=True)
+        for driver in self.drivers:
+            driver.quit()
+        self.drivers.clear()
@@ -1,10 +1,13 @@
+from CrawlPool import CrawlPool
+from ArticleFetcher import ArticleFetcher
+from TextPreprocessor import TextPreprocessor
+from TermStore import TermStore
+from CompanyTagger import CompanyTagger
+
 import sqlite3
 import lxml
-from nltk import word_tokenize
-from nltk.stem import WordNetLemmatizer
-from nltk.tag import pos_tag
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
-from selenium import webdriver
 
 
 class DataBase:
@@ -12,34 +15,65 @@ class DataBase:
     Database class that crawls Google for relevant news articles, extracts important information & adds to SQL Database.
     """
 
-    def __init__(self):
+    def __init__(self, companyNames: list = None, crawlThreads: int = 4, fetchThreads: int = 16, nlpProcesses: int = 1,
+                 driverFactory=None,
+                 searchURL: str = "https://www.google.com/search?q={query}&source=lnms&tbm=nws&start={start}"):
         """
         Class constructor.
-        Establishes connection with SQL Database & initializes webdriver for web crawling.
+        Establishes connection with SQL Database & initializes webdriver pool and HTTP fetcher for web crawling.
+        Only the calling thread uses the SQL Database connection; worker threads only fetch pages.
+
+        :param companyNames: tracked company names to tag in articles, defaults to names in company_names.txt
+        :param crawlThreads: number of concurrent webdrivers
+        :param fetchThreads: number of concurrent plain HTTP article downloads
+        :param nlpProcesses: number of processes for lemmatizing articles
+        :param driverFactory: function returning a new webdriver, defaults to headless Chrome
+        :param searchURL: search results page URL format with {query} and {start} fields
         """
         self.conn = sqlite3.connect("StockDatabase.db")
         self.cur = self.conn.cursor()
+        self.termStore = TermStore(self.conn)
 
         self.articlePageNum = 8
         self.articleSources = ['theguardian']
+        self.searchURL = searchURL
+
+        self.crawlPool = CrawlPool(crawlThreads, driverFactory)
+        self.articleFetcher = ArticleFetcher(fetchThreads)
+        self.preprocessor = TextPreprocessor()
+        self.nlpProcesses = nlpProcesses
+
+        if companyNames is None:
+            with open("company_names.txt") as f:
+                companyNames = [line.strip().split(", ")[1] for line in f if line.strip()]
+        self.companyTagger = CompanyTagger(companyNames)
 
-        self.driver = webdriver.Chrome('chromedriver.exe')
+    def close(self) -> None:
+        """
+        Closes webdriver pool, HTTP fetcher, NLP worker processes & SQL Database connection.
+
+        :return: None
+        """
+        self.crawlPool.close()
+        self.articleFetcher.close()
+        self.preprocessor.close()
+        self.conn.close()
 
     def addArticles(self, companyName: str) -> None:
         """
         Crawls Google for news articles relevant to companyName, stores article document frequency information
-        to SQL Database.
+        to SQL Database. Each new article is also related to every other tracked company it mentions.
 
         :param companyName: Name of company to input into Google
         :return: None
         """
         article_texts = self.__searchArticles(companyName)  # {link: text}
 
-        article_lems = {}
-        for link in article_texts:
-            article_lems[link] = self.__lemmatize(article_texts[link])
-            df_string = self.__frequency(article_lems[link])
-            self.__updateDataTable(link, df_string, companyName)
+        links = list(article_texts)
+        word_freqs = self.preprocessor.frequencyAll([article_texts[link] for link in links], self.nlpProcesses)
+        for link, word_freq in zip(links, word_freqs):
+            companies = {companyName} | self.companyTagger.tag(article_texts[link])
+            self.__updateDataTable(link, word_freq, sorted(companies))
 
     def __searchArticles(self, companyName: str) -> dict:  # {link: text}
         """
@@ -54,82 +88,81 @@ class DataBase:
         for source in self.articleSources:
             articles = []
 
-            for i in range(self.articlePageNum):
-                googleURL = f"https://www.google.com/search?q={companyName}+company+{source}&source=lnms&tbm=nws&start={10 * i}"
-                articles += self.__getArticleURL(source, companyName, googleURL)
+            googleURLs = [
+                self.searchURL.format(query=f"{companyName}+company+{source}", start=10 * i)
+                for i in range(self.articlePageNum)]
+            for googleURL, html in self.crawlPool.fetchAll(googleURLs):
+                articles += self.__getArticleURL(source, companyName, googleURL, html)
+            articles = list(dict.fromkeys(articles))
 
+            newArticles = []
             for articleURL in articles:
-                if self.__existingArticle(articleURL):
-                    self.cur.execute(f"select Stocks from Articles where Article_ID = \'{articleURL}\';")
-                    cur_stocks = self.cur.fetchone()[0]
-                    self.cur.execute(
-                        f"update Articles set Stocks = ? where Article_ID = \'{articleURL}\';",
-                        (cur_stocks + f", {companyName}",))
-                    self.conn.commit()
+                article_num = self.termStore.articleNum(articleURL)
+                if article_num is not None:
+                    self.termStore.addCompanies(article_num, [companyName])
                 else:
-                    extracted = self.__extractArticleText(articleURL)
-                    if extracted is not None:
-                        full_articles[articleURL] = extracted
-        return full_articles
-
-    def __existingArticle(self, article_link: str) -> bool:
-        """
-        Sub method for self.__searchArticles method.
-        Checks if article link already exists in SQL Database.
+                    newArticles.append(articleURL)
+            self.conn.commit()
+
+            # server-rendered articles are read over plain HTTP, Selenium only loads the rest
+            browserArticles = []
+            for articleURL, extracted in self.articleFetcher.fetchAll(newArticles):
+                if extracted is not None:
+                    full_articles[articleURL] = extracted
+                else:
+                    browserArticles.append(articleURL)
 
-        :param article_link: Article link to check for overlap
-        :return: Whether article_link exists or not
-        """
-        self.cur.execute(f"select count(*) from Articles where Article_ID = \'{article_link}\';")
-        count = self.cur.fetchone()
-        return bool(int(count[0]))
+            for articleURL, html in self.crawlPool.fetchAll(browserArticles):
+                extracted = self.__extractArticleText(html)
+                if extracted is not None:
+                    full_articles[articleURL] = extracted
+        return full_articles
 
-    def __getArticleURL(self, source: str, companyName: str, googleURL: str) -> list:  # per Google Page
+    def __getArticleURL(
+            self, source: str, companyName: str, googleURL: str, html: str | None) -> list:  # per Google Page
         """
         Sub method for self.__searchArticles method.
-        Crawls given Google search results page to extract all news article links.
+        Parses given Google search results page to extract all news article links.
 
         :param source: News source to use (Currently TheGuardian is the only option)
         :param companyName: Name of company inputted into Google
         :param googleURL: URL of current Google search results page
+        :param html: html code of current Google search results page
         :return: List of all article URLs
         """
         articles = list()
+        if html is None:
+            return articles
 
-        self.driver.get(googleURL)
-        self.driver.implicitly_wait(10)
-
-        html = self.driver.page_source
         soup = BeautifulSoup(html, "lxml")
 
         searchData = soup.find("div", attrs={"id": "search"})
         if searchData is None:
             print(googleURL)
             print(searchData)
+            return articles
         data = searchData.findAll('a')
         for d in data:
-            article_link = d.attrs['href']
+            article_link = d.attrs.get('href', "")
             # print("Check: {}".format(article_link))
-            if article_link[12: 12 + len(source)] == source and companyName.lower() in article_link:
+            if source in urlparse(article_link).netloc and companyName.lower() in article_link:
                 articles.append(article_link)
                 # print("Passed: {}".format(article_link))
         # print()
         return articles
 
-    def __extractArticleText(self, articleURL: str) -> str | None:  # per Source Article
+    def __extractArticleText(self, html: str | None) -> str | None:  # per Source Article
         """
         Sub method for self.__searchArticles method.
-        Crawls through given news article & extracts all text.
+        Parses given news article html & extracts all text.
 
-        :param articleURL: Given article link
+        :param html: html code of article page
         :return: Extracted text
         """
         article_text = ""
+        if html is None:
+            return None
 
-        self.driver.get(articleURL)
-        self.driver.implicitly_wait(10)
-
-        html = self.driver.page_source
         soup = BeautifulSoup(html, "lxml")
 
         try:
@@ -146,91 +179,15 @@ class DataBase:
         except AttributeError:
             return None
 
-    def __lemmatize(self, text: str) -> list:
-        """
-        Sub method for self.addArticles method.
-        Parses given article text, removing stopwords & lemmatizing words into base form.
-
-        :param text: Extracted full article text
-        :return: List of lemmatized words
-        """
-        stop_file = open("stopwords.txt", "r", encoding='utf8')
-        stopword_list = stop_file.read().split(" ")
-        stop_file.close()
-        article_split = word_tokenize(text)
-        # print("Length: {}".format(len(article_split)))
-        # print(article_split)
-        i = 0
-        while i < len(article_split):
-            if article_split[i].lower() in stopword_list:  # ``, '' included
-                article_split.pop(i)
-            elif not article_split[i].isalpha():
-                article_split.pop(i)
-            else:
-                i += 1
-        # print("Length: {}".format(len(article_split)))
-        # print("Article: {}".format(article_split))
-
-        article_pos = pos_tag(article_split)
-        article_pos_edit = []
-        removed_pos = []
-
-        for (word, pos) in article_pos:
-            if pos[0] in ["N", "V", "A", "R", "S"]:  # N: noun, V: verb, A: adj, R: adv, S: satellite adj
-                if pos == "NNS":
-                    article_pos_edit.append((word[:-1], 'NN'))
-                else:
-                    article_pos_edit.append((word, pos))
-            elif pos[0] == "J":  # JJ - adj
-                article_pos_edit.append((word, "ADJ"))
-            elif pos[0] == "I":  # IN - ex. amid
-                article_pos_edit.append((word, "R"))
-            else:
-                removed_pos.append((word, pos))
-
-        # print("Pos: {}".format(article_pos))
-        # print("Pos Edit: {}".format(article_pos_edit))
-        # print("Removed Words: {}".format(removed_pos))
-
-        lemmatizer = WordNetLemmatizer()
-        article_lem = [lemmatizer.lemmatize(word.lower(), pos[0].lower()) for (word, pos) in article_pos_edit]
-        # print("Lemmatization: {}".format(article_lem))
-        return article_lem
-
-    def __frequency(self, article_lem: list) -> str:
-        """
-        Sub method for self.addArticles method.
-        Finds document frequency for each word in lemmatized word list & formats into string for SQL Database input.
-
-        :param article_lem: Lemmatized article words list
-        :return: Word frequencies in appropriate string format for SQL
-        """
-        word_freq = dict()
-        for word in article_lem:
-            if word in word_freq:
-                word_freq[word] += 1
-            else:
-                word_freq[word] = 1
-
-        tf_string = ""
-        for word in word_freq:
-            if tf_string == "":
-                tf_string = f"({word}, {word_freq[word]})"
-            else:
-                tf_string += f", ({word}, {word_freq[word]})"
-        # print(tf_string)
-        return tf_string
-
-    def __updateDataTable(self, link: str, df_string: str, companyName: str) -> None:
+    def __updateDataTable(self, link: str, word_freq: dict, companies: list) -> None:
         """
         Sub method for self.addArticles method.
-        Inserts article document frequency into SQL Database.
+        Inserts article document frequency & related companies into SQL Database (see TermStore.py).
 
         :param link: Article link
-        :param df_string: Article document frequency in appropriate string format
-        :param companyName: Name of company
+        :param word_freq: Article document frequency {word: frequency}
+        :param companies: Names of companies related to article
         :return: None
         """
-        # print(df_string)
-        self.cur.execute("insert into Articles values(?, ?, ?)", (link, df_string, companyName))
+        self.termStore.addArticle(link, word_freq, companies)
         self.conn.commit()
@@ -0,0 +1,137 @@
+from collections import OrderedDict
+import numpy as np
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+
+
+class KeywordPlot:
+    """
+    KeywordPlot class that draws keyword similarity blocks of company pairs on a Matplotlib figure canvas.
+    A block is drawn either as 3D bars (one bar3d call for all bars) or as a 2D heatmap. Each rendered plot is kept
+    with its axes & pixels in an LRU cache, so showing a cached plot again only blits its pixels back to the canvas.
+    """
+
+    MODES = ('3d', 'heatmap')
+
+    def __init__(self, fig, canvas, cacheSize: int = 16):
+        """
+        Class constructor.
+
+        :param fig: Matplotlib figure to draw on
+        :param canvas: Agg-based figure canvas of fig (ex. FigureCanvasTkAgg)
+        :param cacheSize: maximum number of cached plots
+        """
+        self.fig = fig
+        self.canvas = canvas
+        self.cacheSize = cacheSize
+        self.cache = OrderedDict()  # {(key, mode): [axes, pixel region], ...} from least to most recently shown
+        self.axes = None  # axes currently on figure
+
+    def show(self, key, block: np.ndarray, title: str, mode: str = '3d') -> None:
+        """
+        Shows keyword similarity block, from cache if it was rendered before.
+
+        :param key: hashable key of block data (ex. (stock index 1, stock index 2, relation data version))
+        :param block: (keyword x keyword) similarity block
+        :param title: plot title
+        :param mode: '3d' for bars, 'heatmap' for 2D heatmap
+        :return: None
+        """
+        if mode not in KeywordPlot.MODES:
+            raise ValueError(f"Unsupported keyword plot mode: {mode}")
+
+        cached = self.cache.get((key, mode))
+        if cached is not None:
+            self.cache.move_to_end((key, mode))
+            self.__setAxes(cached[0])
+            region = cached[1]
+            if region is not None and region.get_extents()[2:] == self.__canvasSize():
+                self.canvas.restore_region(region)
+                self.canvas.blit(self.fig.bbox)
+                return
+            # canvas was resized since plot was cached
+            self.canvas.draw()
+            cached[1] = self.canvas.copy_from_bbox(self.fig.bbox)
+            return
+
+        if mode == '3d':
+            axes = self.__drawBars(block, title)
+        else:
+            axes = self.__drawHeatmap(block, title)
+        self.canvas.draw()
+
+        self.cache[(key, mode)] = [axes, self.canvas.copy_from_bbox(self.fig.bbox)]
+        while len(self.cache) > self.cacheSize:
+            self.cache.popitem(last=False)
+
+    def __canvasSize(self) -> tuple:
+        """
+        Helper method for self.show() method.
+
+        :return: (width, height) of figure canvas in pixels
+        """
+        return int(self.fig.bbox.width), int(self.fig.bbox.height)
+
+    def __setAxes(self, axes) -> None:
+        """
+        Helper method for self.show() method.
+        Replaces axes on figure, keeping replaced axes intact for the cache.
+
+        :param axes: axes to put on figure, None to leave figure empty
+        :return: None
+        """
+        if self.axes is not None:
+            self.fig.delaxes(self.axes)
+        if axes is not None:
+            self.fig.add_axes(axes)
+        self.axes = axes
+
+    def __drawBars(self, block: np.ndarray, title: str):
+        """
+        Sub method for self.show() method.
+        Draws block as 3D bars with a single bar3d call.
+
+        :param block: (keyword x keyword) similarity block
+        :param title: plot title
+        :return: new axes
+        """
+        self.__setAxes(None)
+        ax = self.fig.add_subplot(1, 1, 1, projection='3d')
+        self.axes = ax
+
+        keyword_cnt = block.shape[0]
+        ax.set_xticks([i for i in range(keyword_cnt + 1)])
+        ax.set_yticks([i for i in range(keyword_cnt + 1)])
+        ax.set_zticks([0, 0.2, 0.4, 0.6, 0.8, 1])
+        ax.set_zlim(-0.2, 1.0)
+        ax.set_title(title)
+
+        (x, y) = np.meshgrid(np.arange(keyword_cnt), np.arange(keyword_cnt), indexing='ij')
+        dz = block.ravel()
+
+        nrm = mpl.colors.Normalize(-1, 1)
+        colors = plt.cm.RdBu(nrm(-dz))
+        colors[:, 3] = np.linspace(0.2, 0.95, keyword_cnt, endpoint=True)[y.ravel()]
+
+        ax.bar3d(x.ravel(), y.ravel(), np.zeros(len(dz)), 1, 1, dz, color=colors, linewidth=0)
+        return ax
+
+    def __drawHeatmap(self, block: np.ndarray, title: str):
+        """
+        Sub method for self.show() method.
+        Draws block as 2D heatmap, with the same colors as the 3D bars.
+
+        :param block: (keyword x keyword) similarity block
+        :param title: plot title
+        :return: new axes
+        """
+        self.__setAxes(None)
+        ax = self.fig.add_subplot(1, 1, 1)
+        self.axes = ax
+
+        keyword_cnt = block.shape[0]
+        ax.imshow(block.T, cmap='RdBu_r', vmin=-1, vmax=1, origin='lower', interpolation='nearest')
+        ax.set_xticks([i for i in range(keyword_cnt)])
+        ax.set_yticks([i for i in range(keyword_cnt)])
+        ax.set_title(title)
+        return ax
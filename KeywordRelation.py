@@ -0,0 +1,68 @@
+import numpy as np
+
+
+class KeywordRelation:
+    """
+    KeywordRelation class that calculates keyword similarities between companies with normalized word vector matrices.
+    """
+
+    def __init__(self, getVector, keyword_cnt: int):
+        """
+        Class constructor.
+
+        :param getVector: function returning the word vector (np.ndarray) of a given word
+        :param keyword_cnt: number of keywords per company
+        """
+        self.getVector = getVector
+        self.keyword_cnt = keyword_cnt
+
+    def keywordMatrix(self, stockList: list) -> np.ndarray:
+        """
+        Looks up every keyword vector of every stock once and L2-normalizes them.
+        Stocks with fewer than self.keyword_cnt keywords are padded with zero vectors, which have zero similarity
+        with every other keyword.
+
+        :param stockList: list of Stock objects with chosen keywords
+        :return: (stock x keyword x vector dimension) float32 matrix
+        """
+        vectors = dict()  # {word: vector}
+        for stock in stockList:
+            for word in stock.keywords[:self.keyword_cnt]:
+                if word not in vectors:
+                    vectors[word] = np.asarray(self.getVector(word), dtype=np.float32)
+
+        dim = len(next(iter(vectors.values()))) if len(vectors) > 0 else 0
+        matrix = np.zeros((len(stockList), self.keyword_cnt, dim), dtype=np.float32)
+        for i in range(len(stockList)):
+            for j, word in enumerate(stockList[i].keywords[:self.keyword_cnt]):
+                matrix[i, j] = vectors[word]
+
+        norms = np.linalg.norm(matrix, axis=2, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    @staticmethod
+    def allSimilarityBlocks(matrix: np.ndarray) -> np.ndarray:
+        """
+        Calculates similarity between every keyword of every company pair with a single matrix multiply.
+
+        :param matrix: (stock x keyword x vector dimension) normalized keyword matrix
+        :return: (stock x keyword x stock x keyword) similarity blocks, where [i, :, j, :] is the block of pair (i, j)
+        """
+        stock_cnt, keyword_cnt, dim = matrix.shape
+        flat = matrix.reshape(stock_cnt * keyword_cnt, dim)
+        return (flat @ flat.T).reshape(stock_cnt, keyword_cnt, stock_cnt, keyword_cnt)
+
+    @staticmethod
+    def relationScores(blocks: np.ndarray) -> np.ndarray:
+        """
+        Calculates relation values from similarity blocks, assuming basis of 0.25 similarity for significance.
+        Accepts a single (keyword x keyword) block or all (stock x keyword x stock x keyword) blocks.
+
+        :param blocks: keyword similarity block(s)
+        :return: relation value (float) for a single block, (stock x stock) relation matrix for all blocks
+        """
+        scores = (blocks.astype(np.float64) * 10 / 2.5) ** 2
+        if blocks.ndim == 2:
+            return float(scores.sum())
+        return scores.sum(axis=(1, 3))
@@ -25,5 +25,5 @@ if __name__ == "__main__":
     # -- retrieving stock data & running predictions
     system.runAllPredictAnalysis()
 
-    # -- display analysis results --
+    # -- display analysis results (pollInterval=60 keeps polling prices every minute while open) --
     system.runStockGUI()
@@ -0,0 +1,112 @@
+from KeywordRelation import KeywordRelation
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# worker process state, set once per process by _attachMatrix
+_workerMemory = None
+_workerMatrix = None
+
+
+def _attachMatrix(name: str, shape: tuple, dtype: str) -> None:
+    """
+    Process pool initializer.
+    Attaches worker process to the shared keyword matrix without copying it.
+
+    :param name: shared memory block name
+    :param shape: keyword matrix shape
+    :param dtype: keyword matrix dtype
+    :return: None
+    """
+    global _workerMemory, _workerMatrix
+    _workerMemory = shared_memory.SharedMemory(name=name)
+    _workerMatrix = np.ndarray(shape, dtype=np.dtype(dtype), buffer=_workerMemory.buf)
+
+
+def _calculateShard(start: int, end: int) -> tuple:
+    """
+    Process pool task.
+    Calculates similarity blocks and relation values for pairs [start, end) of the flattened (i < j) pair space.
+
+    :param start: first pair index of shard
+    :param end: pair index after last pair of shard
+    :return: (start, (pair x keyword x keyword) similarity blocks, relation values)
+    """
+    first, second = ParallelRelation.pairIndices(_workerMatrix.shape[0])
+    first, second = first[start: end], second[start: end]
+
+    blocks = np.matmul(_workerMatrix[first], _workerMatrix[second].transpose(0, 2, 1))
+    scores = KeywordRelation.relationScores(blocks[:, :, np.newaxis, :]).reshape(-1)
+    return start, blocks, scores
+
+
+class ParallelRelation:
+    """
+    ParallelRelation class that splits the company pair space into shards and calculates them over a process pool.
+    """
+
+    def __init__(self, processes: int = None, shards_per_process: int = 4):
+        """
+        Class constructor.
+
+        :param processes: number of worker processes (defaults to CPU count)
+        :param shards_per_process: number of pair shards per worker process, for load balancing
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.shards_per_process = shards_per_process
+
+    @staticmethod
+    def pairIndices(stock_cnt: int) -> tuple:
+        """
+        Lists every company pair (i, j) with i < j, in the same order as the serial pair loop.
+
+        :param stock_cnt: number of companies
+        :return: (first company indices, second company indices)
+        """
+        return np.triu_indices(stock_cnt, 1)
+
+    def pairShards(self, pair_cnt: int) -> list:
+        """
+        Splits flattened pair space into contiguous shards.
+
+        :param pair_cnt: total number of company pairs
+        :return: [(start, end), ...]
+        """
+        shard_cnt = max(1, min(pair_cnt, self.processes * self.shards_per_process))
+        bounds = np.linspace(0, pair_cnt, shard_cnt + 1).astype(int)
+        return [(int(bounds[k]), int(bounds[k + 1])) for k in range(shard_cnt) if bounds[k] < bounds[k + 1]]
+
+    def calculate(self, matrix: np.ndarray) -> tuple:
+        """
+        Calculates keyword similarity blocks and relation values of all company pairs.
+        The keyword matrix is placed in shared memory, so worker processes read it without their own copies.
+
+        :param matrix: (stock x keyword x vector dimension) normalized keyword matrix
+        :return: (first company indices, second company indices,
+            (pair x keyword x keyword) similarity blocks, relation values), pairs ordered as self.pairIndices
+        """
+        first, second = self.pairIndices(matrix.shape[0])
+        pair_cnt = len(first)
+        blocks = np.zeros((pair_cnt, matrix.shape[1], matrix.shape[1]), dtype=matrix.dtype)
+        scores = np.zeros(pair_cnt, dtype=np.float64)
+        if pair_cnt == 0:
+            return first, second, blocks, scores
+
+        memory = shared_memory.SharedMemory(create=True, size=max(1, matrix.nbytes))
+        try:
+            np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=memory.buf)[:] = matrix
+            with ProcessPoolExecutor(
+                    max_workers=self.processes, initializer=_attachMatrix,
+                    initargs=(memory.name, matrix.shape, matrix.dtype.str)) as executor:
+                futures = [executor.submit(_calculateShard, start, end) for (start, end) in self.pairShards(pair_cnt)]
+                for future in futures:
+                    start, shard_blocks, shard_scores = future.result()
+                    blocks[start: start + len(shard_scores)] = shard_blocks
+                    scores[start: start + len(shard_scores)] = shard_scores
+        finally:
+            memory.close()
+            memory.unlink()
+
+        return first, second, blocks, scores
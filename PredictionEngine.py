@@ -0,0 +1,75 @@
+import numpy as np
+
+
+class PredictionEngine:
+    """
+    PredictionEngine class that predicts stock movement of all stocks at once from company relations.
+    A stock's prediction is its own most recent change plus the most recent changes of all significantly changed
+    stocks, weighted by their normalized relation values:
+
+        prediction = change + R* @ (change * importance)
+    """
+
+    def __init__(self, relations: np.ndarray, relationCutoff: float = 0.5):
+        """
+        Class constructor.
+        Normalizes relation values to [0, 1] over all pairs of different stocks.
+
+        :param relations: (stock x stock) relation values (see RelationStore.py), NaN for unknown pairs
+        :param relationCutoff: minimum normalized relation value of stocks reported as mainly related
+        """
+        self.relationCutoff = relationCutoff
+
+        relations = np.array(relations, dtype=np.float64)
+        np.fill_diagonal(relations, np.nan)
+        known = ~np.isnan(relations)
+        self.minRelation = float(relations[known].min()) if known.any() else 0.0
+        self.maxRelation = float(relations[known].max()) if known.any() else 0.0
+
+        spread = self.maxRelation - self.minRelation
+        self.relations = (relations - self.minRelation) / (spread if spread > 0 else 1)
+        self.relations[~known] = 0  # unknown pairs & stocks themselves have no influence
+
+    def predict(self, changes: np.ndarray, importance: np.ndarray) -> np.ndarray:
+        """
+        Predicts next change of all stocks with one matrix-vector product.
+
+        :param changes: most recent change per stock
+        :param importance: change importance per stock
+        :return: predicted change per stock
+        """
+        changes = np.asarray(changes, dtype=np.float64)
+        return changes + self.relations @ (changes * np.asarray(importance, dtype=np.float64))
+
+    def relatedStocks(self, importance: np.ndarray) -> list:
+        """
+        Finds mainly related stocks of every stock: significantly changed stocks with normalized relation values of
+        at least self.relationCutoff.
+
+        :param importance: change importance per stock
+        :return: [[stock index, ...] by highest relation value first, ...] per stock
+        """
+        related = (self.relations >= self.relationCutoff) & np.asarray(importance, dtype=bool)[np.newaxis, :]
+        np.fill_diagonal(related, False)
+        order = np.argsort(-self.relations, axis=1, kind='stable')
+        return [order[i][related[i][order[i]]].tolist() for i in range(len(order))]
+
+    def predictAll(self, stockList: list) -> list:
+        """
+        Predicts next change of all given stocks in every time period.
+
+        :param stockList: list of analyzed Stock objects, in order of relation matrix
+        :return:
+            [(predicted change USD per stock, predicted change % of current price per stock,
+            [[mainly related stock index, ...], ...] per stock), ...] per time period
+        """
+        curPrices = np.array([stock.stockDataShort[-1] for stock in stockList], dtype=np.float64)
+        horizon_cnt = min([len(stock.stockChangeData) for stock in stockList], default=0)
+
+        results = []
+        for h in range(horizon_cnt):
+            changes = np.array([stock.stockChangeData[h][-1] for stock in stockList], dtype=np.float64)
+            importance = np.array([stock.changeImportance[h] for stock in stockList], dtype=bool)
+            prediction = self.predict(changes, importance)
+            results.append((prediction, prediction / curPrices * 100, self.relatedStocks(importance)))
+        return results
@@ -0,0 +1,300 @@
+from Report import Report
+
+import os
+import sys
+import json
+import threading
+import numpy as np
+import pandas as pd
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class PredictionService:
+    """
+    PredictionService class that answers prediction queries over local HTTP/JSON from precomputed results.
+    Prediction & relation reports of a pipeline run (see Batch.py & Report.py) are loaded into memory once, with
+    every per-ticker answer & ranking prepared in advance. When a new run replaces the reports, a fresh snapshot is
+    built and swapped in with a single assignment, so queries always see one complete run.
+
+    Endpoints:
+    - GET /ticker/<ticker>: predictions of ticker for every time period
+    - GET /top?k=10&interval=1h&order=desc: k stocks with highest (or lowest) predicted change (%)
+    - GET /related/<ticker>?k=5: k stocks with highest relation values to ticker
+    - POST /reload: reloads reports if they changed
+    """
+
+    TEXT_COLUMNS = ('Ticker', 'Company', 'Interval', 'Period', 'Related_Ticker', 'Related_Company')
+
+    def __init__(self, directory: str = "output", reloadInterval: float = 5.0):
+        """
+        Class constructor.
+        Loads reports of given directory.
+
+        :param directory: output directory of pipeline runs
+        :param reloadInterval: seconds between checks for new reports while serving, None to only reload on request
+        """
+        self.directory = directory
+        self.reloadInterval = reloadInterval
+        self.snapshot = None
+        self.reloadLock = threading.Lock()
+        self.stopEvent = threading.Event()
+        if not self.reload():
+            raise FileNotFoundError(f"No prediction reports found in '{directory}', run Batch.py first")
+
+    def __reportPaths(self) -> tuple | None:
+        """
+        Helper method for self.reload() method.
+        Finds most recently written pair of prediction & relation reports.
+
+        :return: (prediction report path, relation report path), None if no reports exist
+        """
+        paths = []
+        for fileFormat in Report.FORMATS:
+            predictionPath = os.path.join(self.directory, f"predictions.{fileFormat}")
+            relationPath = os.path.join(self.directory, f"relations.{fileFormat}")
+            if os.path.exists(predictionPath) and os.path.exists(relationPath):
+                paths.append((predictionPath, relationPath))
+        if len(paths) == 0:
+            return None
+        return max(paths, key=lambda pair: os.stat(pair[0]).st_mtime_ns)
+
+    def reload(self) -> bool:
+        """
+        Loads reports into a new snapshot if a newer run finished since the current snapshot was built.
+        A run writes relations first & predictions last (see System.writeReports() method), so the prediction report
+        marks a finished run, and a relation report newer than it belongs to a run still being written.
+
+        :return: True if a snapshot is loaded, False if no reports exist
+        """
+        with self.reloadLock:
+            paths = self.__reportPaths()
+            if paths is None:
+                return self.snapshot is not None
+            (prediction_time, relation_time) = (os.stat(path).st_mtime_ns for path in paths)
+            if relation_time > prediction_time:
+                # unfinished run, keep current snapshot until its predictions are written
+                return self.snapshot is not None
+            if self.snapshot is not None and self.snapshot['version'] == (paths, prediction_time):
+                return True
+
+            predictions, relations = self.readReport(paths[0]), self.readReport(paths[1])
+            if tuple(os.stat(path).st_mtime_ns for path in paths) != (prediction_time, relation_time):
+                # next run started writing while reading, retry once it finishes
+                return self.snapshot is not None
+            snapshot = self.buildSnapshot(predictions, relations)
+            snapshot['version'] = (paths, prediction_time)
+            self.snapshot = snapshot  # atomic swap, queries keep using whichever snapshot they started with
+            return True
+
+    @staticmethod
+    def readReport(path: str) -> pd.DataFrame:
+        """
+        Reads report written by Report.write() method.
+
+        :param path: report path ending with .csv, .json or .parquet
+        :return: report DataFrame, with list columns restored
+        """
+        if path.endswith(".csv"):
+            # text columns are kept as written (ex. ticker "NA"), empty numeric cells are read as NaN
+            converters = {column: str for column in PredictionService.TEXT_COLUMNS}
+            converters['Related_Companies'] = lambda value: value.split("; ") if value else []
+            return pd.read_csv(path, converters=converters)
+        if path.endswith(".json"):
+            return pd.read_json(path, orient='records')
+        table = pd.read_parquet(path)
+        if 'Related_Companies' in table:
+            table['Related_Companies'] = [list(value) for value in table['Related_Companies']]
+        return table
+
+    @staticmethod
+    def buildSnapshot(predictions: pd.DataFrame, relations: pd.DataFrame) -> dict:
+        """
+        Prepares every answer the service gives from report tables.
+
+        :param predictions: prediction report (see Report.predictionTable() method)
+        :param relations: relation report (see Report.relationTable() method)
+        :return: {'tickers': {ticker: encoded answer}, 'ranked': {interval: [row, ...] by highest predicted change},
+                  'related': {ticker: [row, ...] by highest relation value}}
+        """
+        rows = dict()  # {ticker: [row per time period, ...]}
+        ranked = dict()  # {interval: [row, ...]}
+        for record in predictions.to_dict(orient='records'):
+            row = {
+                'ticker': record['Ticker'], 'company': record['Company'],
+                'interval': record['Interval'], 'period': record['Period'],
+                'price': PredictionService.number(record['Price']),
+                'change': PredictionService.number(record['Change']),
+                'changePct': PredictionService.number(record['Change_Pct']),
+                'significant': None if pd.isna(record['Significant']) else bool(record['Significant']),
+                'predictedChange': PredictionService.number(record['Predicted_Change']),
+                'predictedPct': PredictionService.number(record['Predicted_Pct']),
+                'relatedCompanies': list(record['Related_Companies'])
+            }
+            rows.setdefault(row['ticker'], []).append(row)
+            ranked.setdefault(row['interval'], [])
+            if row['predictedPct'] is not None:
+                # stocks without prediction are left out of rankings
+                ranked[row['interval']].append(row)
+        for interval in ranked:
+            ranked[interval].sort(key=lambda row: row['predictedPct'], reverse=True)
+
+        related = dict()  # {ticker: [row, ...]}
+        order = np.argsort(-relations['Normalized_Relation'].to_numpy(dtype=np.float64), kind='stable')
+        for record in relations.iloc[order].to_dict(orient='records'):
+            related.setdefault(record['Ticker'], []).append({
+                'ticker': record['Related_Ticker'], 'company': record['Related_Company'],
+                'relation': PredictionService.number(record['Relation']),
+                'normalizedRelation': PredictionService.number(record['Normalized_Relation'])
+            })
+
+        tickers = {ticker: json.dumps({'ticker': ticker, 'predictions': rows[ticker]}, allow_nan=False).encode('utf8')
+                   for ticker in rows}
+        return {'tickers': tickers, 'ranked': ranked, 'related': related}
+
+    @staticmethod
+    def number(value) -> float | None:
+        """
+        Helper method for self.buildSnapshot() method.
+        Converts report value to a number JSON can encode.
+
+        :param value: numeric report value
+        :return: float, None if value is missing, NaN or infinite
+        """
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        return value if np.isfinite(value) else None
+
+    def ticker(self, ticker: str) -> bytes | None:
+        """
+        Answers predictions of given ticker.
+
+        :param ticker: stock symbol
+        :return: encoded JSON answer, None if ticker is unknown
+        """
+        return self.snapshot['tickers'].get(ticker)
+
+    def top(self, k: int, interval: str = None, order: str = 'desc') -> list:
+        """
+        Answers stocks with highest (or lowest) predicted change (%).
+
+        :param k: number of stocks
+        :param interval: bar interval of time period, defaults to the first time period
+        :param order: 'desc' for highest, 'asc' for lowest predicted change
+        :return: [prediction row, ...]
+        """
+        ranked = self.snapshot['ranked']
+        rows = ranked.get(interval if interval is not None else next(iter(ranked), None), [])
+        return rows[:k] if order == 'desc' else rows[::-1][:k]
+
+    def related(self, ticker: str, k: int) -> list | None:
+        """
+        Answers stocks with highest relation values to given ticker.
+
+        :param ticker: stock symbol
+        :param k: number of stocks
+        :return: [relation row, ...], None if ticker is unknown
+        """
+        if ticker not in self.snapshot['tickers']:
+            return None
+        return self.snapshot['related'].get(ticker, [])[:k]
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        """
+        Serves queries until interrupted, checking for new reports every self.reloadInterval seconds.
+
+        :param host: address to listen on (local only by default)
+        :param port: port to listen on
+        :return: None
+        """
+        server = ThreadingHTTPServer((host, port), _RequestHandler)
+        server.service = self
+        if self.reloadInterval is not None:
+            threading.Thread(target=self.__watch, name="PredictionServiceReload", daemon=True).start()
+        try:
+            server.serve_forever()
+        finally:
+            self.stopEvent.set()
+            server.server_close()
+
+    def __watch(self) -> None:
+        """
+        Sub method for self.serve() method.
+        Reloads reports whenever they change, until serving stops.
+
+        :return: None
+        """
+        while not self.stopEvent.wait(self.reloadInterval):
+            try:
+                self.reload()
+            except Exception as e:
+                # keep serving the current snapshot
+                print(f"Report reload failed: {e!r}")
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP request handler of PredictionService.
+    """
+
+    def do_GET(self) -> None:
+        service = self.server.service
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split("/") if part]
+        try:
+            k = int(query.get('k', ['10'])[0])
+        except ValueError:
+            return self.__send(400, {'error': "k must be an integer"})
+
+        if len(parts) == 2 and parts[0] == 'ticker':
+            answer = service.ticker(parts[1])
+            if answer is None:
+                return self.__send(404, {'error': f"unknown ticker {parts[1]}"})
+            return self.__send(200, answer)
+        if len(parts) == 1 and parts[0] == 'top':
+            return self.__send(200, service.top(
+                k, query.get('interval', [None])[0], query.get('order', ['desc'])[0]))
+        if len(parts) == 2 and parts[0] == 'related':
+            answer = service.related(parts[1], k)
+            if answer is None:
+                return self.__send(404, {'error': f"unknown ticker {parts[1]}"})
+            return self.__send(200, answer)
+        return self.__send(404, {'error': "unknown endpoint"})
+
+    def do_POST(self) -> None:
+        if urlparse(self.path).path.rstrip("/") == '/reload':
+            return self.__send(200, {'reloaded': self.server.service.reload()})
+        return self.__send(404, {'error': "unknown endpoint"})
+
+    def __send(self, status: int, body) -> None:
+        """
+        Sends JSON response.
+
+        :param status: HTTP status code
+        :param body: encoded JSON or JSON-serializable object
+        :return: None
+        """
+        if not isinstance(body, bytes):
+            body = json.dumps(body, allow_nan=False).encode('utf8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        # queries are not logged
+        pass
+
+
+if __name__ == "__main__":
+    # usage: python PredictionService.py [output directory] [port]
+    directory = sys.argv[1] if len(sys.argv) > 1 else "output"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+
+    service = PredictionService(directory)
+    print(f"Serving predictions from {directory} on http://127.0.0.1:{port}")
+    service.serve(port=port)
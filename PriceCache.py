@@ -0,0 +1,255 @@
+from PriceProvider import periodOffset
+
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+
+
+class PriceCache:
+    """
+    PriceCache class that keeps downloaded OHLCV price bars in a local SQL Database, keyed by ticker & interval.
+    Has the same interface as the price providers (see PriceProvider.py), serving every request from the cache.
+    Cached tickers are refreshed by appending only the bars after their last cached bar, as long as the cache covers
+    the requested time period; otherwise the whole period is downloaded again. In offline mode the cache is served as
+    is without any download.
+
+    Tables:
+    - Bars (Ticker, Interval, Time, Open, High, Low, Close, Adj_Close, Volume): Time is the bar's UTC epoch second
+    - Ticker_Zones (Ticker, Timezone): exchange time zone of each ticker's bars
+    - Coverage (Ticker, Interval, Start, Refreshed): UTC epoch seconds from which bars were last downloaded in full,
+      and of the last download
+    """
+
+    COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
+    def __init__(self, provider=None, path: str = "PriceCache.db", offline: bool = False):
+        """
+        Class constructor.
+        Opens (and creates if needed) the cache database.
+
+        :param provider: price provider refreshing the cache (see PriceProvider.py), not needed in offline mode
+        :param path: path of cache database
+        :param offline: True to serve cached bars only, without downloading
+        """
+        if provider is None and not offline:
+            raise ValueError("PriceCache needs a price provider unless offline")
+        self.provider = provider
+        self.offline = offline
+
+        # may be polled from a background thread (see PriceFeed.py), one request at a time
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.cur = self.conn.cursor()
+        self.cur.execute(
+            "create table if not exists Bars ("
+            "Ticker text not null, Interval text not null, Time integer not null, "
+            "Open real, High real, Low real, Close real, Adj_Close real, Volume real, "
+            "primary key (Ticker, Interval, Time)) without rowid;")
+        self.cur.execute("create table if not exists Ticker_Zones (Ticker text primary key, Timezone text);")
+        self.cur.execute(
+            "create table if not exists Coverage ("
+            "Ticker text not null, Interval text not null, Start integer not null, Refreshed integer not null, "
+            "primary key (Ticker, Interval)) without rowid;")
+        self.conn.commit()
+
+    def history(self, tickers: list, interval: str, period: str) -> tuple:
+        """
+        Serves price bars of all given tickers for given time period, measured back from each ticker's last bar.
+        Refreshes the cache first unless offline. Offline, tickers whose cache does not reach back over the whole
+        time period fail.
+
+        :param tickers: list of stock symbols
+        :param interval: bar interval (ex. '1h')
+        :param period: time period (ex. '1mo')
+        :return: ({ticker: OHLCV DataFrame}, {ticker: failure reason}) covering every given ticker
+        """
+        with self.lock:
+            failures = dict() if self.offline else self.refresh(tickers, interval, period)
+            coverage = self.coverage(interval)
+
+            frames = dict()
+            for ticker in tickers:
+                stock_df = self.__load(ticker, interval)
+                if stock_df is None:
+                    failures.setdefault(ticker, "no cached price data")
+                    continue
+                if self.offline and ticker in coverage and not self.__covers(coverage[ticker], period):
+                    failures[ticker] = f"cached price data does not cover period {period}"
+                    continue
+                failures.pop(ticker, None)
+                frames[ticker] = stock_df[stock_df.index > stock_df.index[-1] - periodOffset(period)]
+        return frames, failures
+
+    def historySince(self, tickers: list, interval: str, start: pd.Timestamp) -> tuple:
+        """
+        Serves price bars of all given tickers from given start time onwards (ex. for polling recent bars).
+        Unless offline, bars after each ticker's last cached bar are downloaded first.
+
+        :param tickers: list of stock symbols
+        :param interval: bar interval (ex. '1h')
+        :param start: time of first requested bar
+        :return: ({ticker: OHLCV DataFrame}, {ticker: failure reason}) covering every given ticker
+        """
+        start = pd.Timestamp(start)
+        start = start.tz_localize('UTC') if start.tzinfo is None else start.tz_convert('UTC')
+        start_time = int(start.timestamp())
+
+        with self.lock:
+            failures = dict()
+            if not self.offline:
+                lastTimes = self.lastTimes(interval)
+                # download from the last cached bar at the latest, so the cache stays without gaps
+                cached = [lastTimes[ticker] for ticker in tickers if ticker in lastTimes]
+                since = pd.Timestamp(min(cached + [start_time]), unit='s', tz='UTC').floor('D')
+                frames, failures = self.provider.historySince(tickers, interval, since)
+                self.__storeAll(frames, interval, lastTimes)
+                self.cur.executemany(
+                    "update Coverage set Refreshed = ? where Ticker = ? and Interval = ?;",
+                    [(int(pd.Timestamp.now(tz='UTC').timestamp()), ticker, interval) for ticker in frames])
+                self.conn.commit()
+
+            frames = dict()
+            for ticker in tickers:
+                stock_df = self.__load(ticker, interval, start_time)
+                if stock_df is None:
+                    failures.setdefault(ticker, "no cached price data")
+                    continue
+                failures.pop(ticker, None)
+                frames[ticker] = stock_df
+        return frames, failures
+
+    def refresh(self, tickers: list, interval: str, period: str) -> dict:
+        """
+        Brings cached bars of all given tickers up to date.
+        Tickers cached over the whole time period only download bars from the day of their last cached bar onwards,
+        others (ex. after the time period grew) download the whole time period.
+
+        :param tickers: list of stock symbols
+        :param interval: bar interval (ex. '1h')
+        :param period: time period (ex. '1mo')
+        :return: {ticker: failure reason} for tickers that could not be downloaded
+        """
+        lastTimes = self.lastTimes(interval)
+        coverage = self.coverage(interval)
+        now = pd.Timestamp.now(tz='UTC')
+        oldest = int((now - periodOffset(period)).timestamp())
+
+        full = []
+        since = dict()  # {start day: [ticker1, ticker2, ...]}
+        for ticker in dict.fromkeys(tickers):
+            if lastTimes.get(ticker, 0) < oldest or ticker not in coverage or coverage[ticker][0] > oldest:
+                full.append(ticker)
+            else:
+                start = pd.Timestamp(lastTimes[ticker], unit='s', tz='UTC').floor('D')
+                since.setdefault(start, []).append(ticker)
+
+        failures = dict()
+        if len(full) > 0:
+            frames, failed = self.provider.history(full, interval, period)
+            failures.update(failed)
+            # whole period is stored, including bars before cached ones
+            self.__storeAll(frames, interval, dict())
+            self.cur.executemany(
+                "insert or replace into Coverage values (?, ?, ?, ?);",
+                [(ticker, interval, oldest, int(now.timestamp())) for ticker in frames])
+        for start in since:
+            frames, failed = self.provider.historySince(since[start], interval, start)
+            failures.update(failed)
+            self.__storeAll(frames, interval, lastTimes)
+            self.cur.executemany(
+                "update Coverage set Refreshed = ? where Ticker = ? and Interval = ?;",
+                [(int(now.timestamp()), ticker, interval) for ticker in frames])
+        self.conn.commit()
+        return failures
+
+    def lastTimes(self, interval: str) -> dict:
+        """
+        Finds last cached bar time of every cached ticker.
+
+        :param interval: bar interval (ex. '1h')
+        :return: {ticker: UTC epoch second of last cached bar}
+        """
+        self.cur.execute("select Ticker, max(Time) from Bars where Interval = ? group by Ticker;", (interval,))
+        return dict(self.cur.fetchall())
+
+    def coverage(self, interval: str) -> dict:
+        """
+        Finds which time period the cached bars of every ticker cover. Tickers cached before coverage was recorded
+        are left out.
+
+        :param interval: bar interval (ex. '1h')
+        :return: {ticker: (UTC epoch second of covered start, UTC epoch second of last download)}
+        """
+        self.cur.execute("select Ticker, Start, Refreshed from Coverage where Interval = ?;", (interval,))
+        return {ticker: (start, refreshed) for (ticker, start, refreshed) in self.cur.fetchall()}
+
+    @staticmethod
+    def __covers(coverage: tuple, period: str) -> bool:
+        """
+        Helper method for self.history() method.
+
+        :param coverage: (covered start, last download) of a ticker (see self.coverage() method)
+        :param period: time period (ex. '1mo')
+        :return: True if cached bars cover given time period, measured back from the last download
+        """
+        (start, refreshed) = coverage
+        needed = pd.Timestamp(refreshed, unit='s', tz='UTC') - periodOffset(period)
+        return pd.Timestamp(start, unit='s', tz='UTC') <= needed
+
+    def __storeAll(self, frames: dict, interval: str, lastTimes: dict) -> None:
+        """
+        Sub method for self.refresh() method.
+        Appends downloaded bars newer than each ticker's last cached bar. The last cached bar itself is
+        overwritten, as it may have still been in progress when it was cached. Does not commit.
+
+        :param frames: {ticker: downloaded OHLCV DataFrame}
+        :param interval: bar interval (ex. '1h')
+        :param lastTimes: {ticker: UTC epoch second of last cached bar}
+        :return: None
+        """
+        for ticker in frames:
+            stock_df = frames[ticker]
+            index = stock_df.index if stock_df.index.tz is not None else stock_df.index.tz_localize('UTC')
+            times = ((index - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)).to_numpy()
+            values = stock_df.reindex(columns=self.COLUMNS).to_numpy(dtype=np.float64)
+
+            new = times >= lastTimes.get(ticker, 0)
+            rows = [(ticker, interval, int(t)) + tuple(None if np.isnan(v) else float(v) for v in row)
+                    for t, row in zip(times[new], values[new])]
+            self.cur.executemany("insert or replace into Bars values (?, ?, ?, ?, ?, ?, ?, ?, ?);", rows)
+            self.cur.execute("insert or replace into Ticker_Zones values (?, ?);", (ticker, str(index.tz)))
+
+    def __load(self, ticker: str, interval: str, start: int = 0) -> pd.DataFrame | None:
+        """
+        Sub method for self.history() and self.historySince() methods.
+        Reads cached bars of given ticker.
+
+        :param ticker: stock symbol
+        :param interval: bar interval (ex. '1h')
+        :param start: UTC epoch second of first bar to read
+        :return: OHLCV DataFrame indexed by bar time in exchange time zone, None if no bars are cached
+        """
+        self.cur.execute(
+            "select Time, Open, High, Low, Close, Adj_Close, Volume from Bars "
+            "where Ticker = ? and Interval = ? and Time >= ? order by Time;", (ticker, interval, start))
+        rows = self.cur.fetchall()
+        if len(rows) == 0:
+            return None
+
+        self.cur.execute("select Timezone from Ticker_Zones where Ticker = ?;", (ticker,))
+        zone = self.cur.fetchone()
+        data = np.array(rows, dtype=np.float64)
+        index = pd.to_datetime(data[:, 0].astype(np.int64), unit='s', utc=True)
+        if zone is not None:
+            index = index.tz_convert(zone[0])
+        return pd.DataFrame(data[:, 1:], index=index, columns=self.COLUMNS)
+
+    def close(self) -> None:
+        """
+        Closes cache database.
+
+        :return: None
+        """
+        self.conn.close()
+
@@ -0,0 +1,131 @@
+from StockData import StockData
+from PriceProvider import alignTimestamp
+
+import queue
+import threading
+import numpy as np
+import pandas as pd
+
+
+class PriceFeed:
+    """
+    PriceFeed class that polls a price provider on a background thread at a fixed interval.
+    Each poll only downloads the bars from the start of every stock's most recent (possibly still in progress) bar
+    onwards, and resamples them into every time period on the background thread. Only the mid-prices of updated &
+    new bars are handed over through a queue, so stock data is only ever modified by the thread reading them
+    (ex. the GUI thread).
+    """
+
+    def __init__(self, provider, stockList: list, horizons: list, pollInterval: float = 60.0):
+        """
+        Class constructor.
+
+        :param provider: price provider (see PriceProvider.py & PriceCache.py)
+        :param stockList: list of loaded Stock objects (see StockData.loadData() method)
+        :param horizons: list of time periods [(interval, period), ...]
+        :param pollInterval: seconds between polls
+        """
+        self.provider = provider
+        self.horizons = horizons
+        self.interval = StockData.baseHorizon(horizons)[0]
+        self.pollInterval = pollInterval
+        # copied, as stock data belongs to the thread reading the updates
+        self.lastBarTimes = {stock.stockName: list(stock.lastBarTime) for stock in stockList
+                             if len(stock.lastBarTime) > 0}
+
+        self.updates = queue.Queue()
+        self.stopEvent = threading.Event()
+        self.thread = None
+
+    def start(self) -> None:
+        """
+        Starts polling on a background (daemon) thread.
+
+        :return: None
+        """
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stopEvent.clear()
+        self.thread = threading.Thread(target=self.__run, name="PriceFeed", daemon=True)
+        self.thread.start()
+
+    def __run(self) -> None:
+        """
+        Sub method for self.start() method.
+        Polls provider until stopped. Failed polls are reported & retried at the next interval.
+
+        :return: None
+        """
+        while not self.stopEvent.wait(self.pollInterval):
+            try:
+                update = self.__poll()
+            except Exception as e:
+                print(f"Price update failed: {e!r}")
+                continue
+            if len(update) > 0:
+                self.updates.put(update)
+
+    def __poll(self) -> dict:
+        """
+        Sub method for self.__run() method.
+        Downloads bars from the earliest most recent bar of each stock onwards & resamples them into every time period.
+
+        :return: {stock symbol: [mid-price Series of bars from the most recent known bar onwards, ...] per time period}
+        """
+        starts = dict()  # {start time: [ticker1, ticker2, ...]}
+        for ticker in self.lastBarTimes:
+            starts.setdefault(min(self.lastBarTimes[ticker]), []).append(ticker)
+
+        update = dict()
+        for start in starts:
+            frames, failures = self.provider.historySince(starts[start], self.interval, start)
+            for ticker in frames:
+                stock_df = frames[ticker]
+                if len(stock_df) == 0:
+                    continue
+                stock_df = stock_df[stock_df.index >= alignTimestamp(start, stock_df.index)]
+                stock_dfs = StockData.resampleData(stock_df, self.interval, self.horizons)
+
+                prices = []
+                for h in range(len(self.horizons)):
+                    horizon_df = stock_dfs[h].ffill()
+                    horizon_df = horizon_df[horizon_df.index >= self.lastBarTimes[ticker][h]]
+                    prices.append(((horizon_df['High'] + horizon_df['Low']) / 2).astype(np.float64))
+                    if len(horizon_df) > 0:
+                        self.lastBarTimes[ticker][h] = horizon_df.index[-1]
+                update[ticker] = prices
+        return update
+
+    def latest(self) -> dict | None:
+        """
+        Takes all price updates polled since the last call, without blocking.
+
+        :return: {stock symbol: [mid-price Series, ...] per time period} merged from all pending polls (newest bar
+        values win), None if none pending
+        """
+        prices = None
+        while True:
+            try:
+                update = self.updates.get_nowait()
+            except queue.Empty:
+                return prices
+            if prices is None:
+                prices = update
+                continue
+            for ticker in update:
+                if ticker not in prices:
+                    prices[ticker] = update[ticker]
+                    continue
+                merged = [pd.concat([prices[ticker][h], update[ticker][h]]) for h in range(len(update[ticker]))]
+                prices[ticker] = [series[~series.index.duplicated(keep='last')] for series in merged]
+
+    def stop(self) -> None:
+        """
+        Stops polling & waits for the background thread to finish its current poll.
+
+        :return: None
+        """
+        self.stopEvent.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
@@ -0,0 +1,242 @@
+import time
+import pandas as pd
+import yfinance as yf
+
+
+class YahooProvider:
+    """
+    YahooProvider class that downloads OHLCV price bars for many tickers at once using Yahoo Finance Library.
+    Tickers are requested in batches, each batch fetched concurrently by yfinance's thread pool over its shared
+    (pooled) session. Failed tickers are retried with exponential backoff & reported instead of aborting.
+    """
+
+    def __init__(self, batchSize: int = 100, threads: int = 8, retries: int = 3, backoff: float = 1.0):
+        """
+        Class constructor.
+
+        :param batchSize: maximum number of tickers per download request batch
+        :param threads: number of concurrent ticker downloads per batch
+        :param retries: number of retries for failed tickers
+        :param backoff: wait (seconds) before first retry, doubled on every following retry
+        """
+        self.batchSize = batchSize
+        self.threads = threads
+        self.retries = retries
+        self.backoff = backoff
+
+    def history(self, tickers: list, interval: str, period: str) -> tuple:
+        """
+        Downloads price bars of all given tickers for given time period.
+
+        :param tickers: list of stock symbols
+        :param interval: bar interval (ex. '1h')
+        :param period: time period (ex. '1mo')
+        :return: ({ticker: OHLCV DataFrame}, {ticker: failure reason}) covering every given ticker
+        """
+        return self.__download(tickers, interval=interval, period=period)
+
+    def historySince(self, tickers: list, interval: str, start: pd.Timestamp) -> tuple:
+        """
+        Downloads price bars of all given tickers from given start time onwards.
+
+        :param tickers: list of stock symbols
+        :param interval: bar interval (ex. '1h')
+        :param start: time of first requested bar
+        :return: ({ticker: OHLCV DataFrame}, {ticker: failure reason}) covering every given ticker
+        """
+        return self.__download(tickers, interval=interval, start=start)
+
+    def __download(self, tickers: list, **kwargs) -> tuple:
+        """
+        Sub method for self.history() and self.historySince() methods.
+        Downloads given tickers in batches, retrying failed tickers.
+
+        :param tickers: list of stock symbols
+        :param kwargs: yf.download time range arguments
+        :return: ({ticker: OHLCV DataFrame}, {ticker: failure reason}) covering every given ticker
+        """
+        frames = dict()
+        failures = dict()
+        pending = list(dict.fromkeys(tickers))
+
+        for attempt in range(self.retries + 1):
+            if attempt > 0:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+            failed = []
+            # yf.download keeps module-level state, so batches run one after another
+            for k in range(0, len(pending), self.batchSize):
+                batch = pending[k: k + self.batchSize]
+                try:
+                    batch_df = yf.download(
+                        batch, group_by='ticker', auto_adjust=False, threads=self.threads, progress=False, **kwargs)
+                except Exception as e:
+                    for ticker in batch:
+                        failures[ticker] = repr(e)
+                    failed += batch
+                    continue
+
+                for ticker in batch:
+                    stock_df = self.__tickerFrame(batch_df, ticker)
+                    if stock_df is None:
+                        failures[ticker] = "no price data returned"
+                        failed.append(ticker)
+                    else:
+                        frames[ticker] = stock_df
+                        failures.pop(ticker, None)
+
+            pending = failed
+            if len(pending) == 0:
+                break
+
+        return frames, {ticker: failures[ticker] for ticker in pending}
+
+    @staticmethod
+    def __tickerFrame(batch_df: pd.DataFrame, ticker: str) -> pd.DataFrame | None:
+        """
+        Helper method for self.__download() method.
+        Extracts single ticker's bars from a batch download.
+
+        :param batch_df: DataFrame returned by yf.download
+        :param ticker: stock symbol
+        :return: ticker's OHLCV DataFrame, None if ticker has no data
+        """
+        if isinstance(batch_df.columns, pd.MultiIndex):
+            if ticker not in batch_df.columns.get_level_values(0):
+                return None
+            stock_df = batch_df[ticker]
+        else:
+            stock_df = batch_df
+        stock_df = stock_df.dropna(how='all')
+        if len(stock_df) == 0:
+            return None
+        return stock_df
+
+
+class FrameProvider:
+    """
+    FrameProvider class that serves given price DataFrames instead of downloading them.
+    Has the same interface as YahooProvider, for running offline (ex. in tests).
+    """
+
+    def __init__(self, frames: dict):
+        """
+        Class constructor.
+
+        :param frames: {(ticker, interval): OHLCV DataFrame}
+        """
+        self.frames = frames
+
+    def history(self, tickers: list, interval: str, period: str) -> tuple:
+        """
+        Serves price bars of all given tickers for given time period, measured back from each ticker's last bar.
+
+        :param tickers: list of stock symbols
+        :param interval: bar interval (ex. '1h')
+        :param period: time period (ex. '1mo')
+        :return: ({ticker: OHLCV DataFrame}, {ticker: failure reason}) covering every given ticker
+        """
+        frames = dict()
+        failures = dict()
+        for ticker in tickers:
+            stock_df = self.frames.get((ticker, interval))
+            if stock_df is None or len(stock_df) == 0:
+                failures[ticker] = "no price data available"
+                continue
+            frames[ticker] = stock_df[stock_df.index > stock_df.index[-1] - periodOffset(period)]
+        return frames, failures
+
+    def historySince(self, tickers: list, interval: str, start: pd.Timestamp) -> tuple:
+        """
+        Serves price bars of all given tickers from given start time onwards.
+
+        :param tickers: list of stock symbols
+        :param interval: bar interval (ex. '1h')
+        :param start: time of first requested bar
+        :return: ({ticker: OHLCV DataFrame}, {ticker: failure reason}) covering every given ticker
+        """
+        frames = dict()
+        failures = dict()
+        for ticker in tickers:
+            stock_df = self.frames.get((ticker, interval))
+            if stock_df is None or len(stock_df) == 0:
+                failures[ticker] = "no price data available"
+                continue
+            frames[ticker] = stock_df[stock_df.index >= alignTimestamp(start, stock_df.index)]
+        return frames, failures
+
+
+def alignTimestamp(timestamp: pd.Timestamp, index: pd.DatetimeIndex) -> pd.Timestamp:
+    """
+    Converts timestamp into time zone of given index, so they can be compared.
+
+    :param timestamp: given timestamp
+    :param index: DatetimeIndex of price bars
+    :return: timestamp in time zone of index (naive if index is naive)
+    """
+    timestamp = pd.Timestamp(timestamp)
+    if index.tz is None:
+        return timestamp.tz_convert(None) if timestamp.tzinfo is not None else timestamp
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize('UTC')
+    return timestamp.tz_convert(index.tz)
+
+
+def periodOffset(period: str) -> pd.DateOffset:
+    """
+    Converts Yahoo Finance period string into a pandas offset.
+
+    :param period: time period (ex. '5d', '1mo', '6mo', '1y')
+    :return: pandas DateOffset
+    """
+    units = {'d': 'days', 'wk': 'weeks', 'mo': 'months', 'y': 'years'}
+    for suffix in ('mo', 'wk', 'd', 'y'):
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return pd.DateOffset(**{units[suffix]: int(period[:-len(suffix)])})
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def intervalRule(interval: str) -> str:
+    """
+    Converts Yahoo Finance bar interval string into a pandas resampling rule.
+
+    :param interval: bar interval (ex. '1h', '1d', '1wk', '1mo')
+    :return: pandas offset alias, weeks starting on Monday & months on their first day like Yahoo Finance bars
+    """
+    rules = {'m': 'min', 'h': 'h', 'd': 'D', 'wk': 'W-MON', 'mo': 'MS'}
+    for suffix in ('mo', 'wk', 'm', 'h', 'd'):
+        if interval.endswith(suffix) and interval[:-len(suffix)].isdigit():
+            return f"{interval[:-len(suffix)]}{rules[suffix]}"
+    raise ValueError(f"Unsupported interval: {interval}")
+
+
+def intervalLength(interval: str) -> pd.Timedelta:
+    """
+    Approximates length of Yahoo Finance bar interval, for ordering intervals.
+
+    :param interval: bar interval (ex. '1h', '1d', '1wk', '1mo')
+    :return: approximate bar length
+    """
+    lengths = {'m': pd.Timedelta(minutes=1), 'h': pd.Timedelta(hours=1), 'd': pd.Timedelta(days=1),
+               'wk': pd.Timedelta(weeks=1), 'mo': pd.Timedelta(days=30)}
+    for suffix in ('mo', 'wk', 'm', 'h', 'd'):
+        if interval.endswith(suffix) and interval[:-len(suffix)].isdigit():
+            return int(interval[:-len(suffix)]) * lengths[suffix]
+    raise ValueError(f"Unsupported interval: {interval}")
+
+
+def intervalHistory(interval: str) -> pd.Timedelta | None:
+    """
+    Gives how far back Yahoo Finance serves bars of given interval.
+
+    :param interval: bar interval (ex. '1h', '1d', '1wk', '1mo')
+    :return: longest servable history, None if unlimited (daily & longer bars)
+    """
+    length = intervalLength(interval)
+    if length < pd.Timedelta(minutes=2):
+        return pd.Timedelta(days=7)
+    if length < pd.Timedelta(hours=1):
+        return pd.Timedelta(days=60)
+    if length < pd.Timedelta(days=1):
+        return pd.Timedelta(days=730)
+    return None
@@ -0,0 +1,123 @@
+from RelationStore import RelationStore
+from SpatialGrid import SpatialGrid
+
+import base64
+import numpy as np
+from io import BytesIO
+from collections import OrderedDict
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+class RelationNetwork:
+    """
+    RelationNetwork class for drawing the relation network of many companies, with stocks on a circle and relations
+    as edges colored black (lowest) to cyan (highest relation value).
+    Edges are culled to those with a normalized relation value of at least a threshold, optionally keeping only each
+    stock's top k relations. The remaining edges are rendered into one cached image instead of one canvas item per
+    edge, node sizes shrink with the number of stocks, and stocks are found under the cursor with a spatial grid.
+    """
+
+    def __init__(self, relationStore: RelationStore, width: int, height: int, radius: float, cacheSize: int = 8):
+        """
+        Class constructor.
+        Places all stocks of relation store on a circle.
+
+        :param relationStore: relations of all stocks (see RelationStore.py)
+        :param width: width of drawing area in pixels
+        :param height: height of drawing area in pixels
+        :param radius: circle radius in pixels
+        :param cacheSize: maximum number of cached edge images
+        """
+        self.width = width
+        self.height = height
+        self.cacheSize = cacheSize
+        self.images = OrderedDict()  # {(threshold, top k): base64 PNG}, from least to most recently used
+
+        stock_cnt = len(relationStore.values)
+        angles = 2 * np.pi / max(stock_cnt, 1) * np.arange(stock_cnt)
+        self.positions = np.column_stack([width // 2 + np.sin(angles) * radius, height // 2 - np.cos(angles) * radius])
+
+        # level of detail: nodes shrink to the spacing between them, labels only fit on larger nodes
+        spacing = 2 * np.pi * radius / max(stock_cnt, 1)
+        self.nodeWidth = int(min(50, max(6, spacing * 0.8)))
+        self.nodeHeight = int(self.nodeWidth * 0.8)
+        self.showLabels = self.nodeWidth >= 24
+        self.grid = SpatialGrid(self.positions, self.nodeWidth)
+
+        spread = relationStore.maxRelation - relationStore.minRelation
+        normalized = (relationStore.values - relationStore.minRelation) / (spread if spread > 0 else 1)
+        self.normalized = np.fmax(normalized, normalized.T)  # NaN where relation is unknown in both directions
+
+        self.threshold = 0.0
+        self.topK = 0
+        self.first, self.second = np.array([], dtype=int), np.array([], dtype=int)
+        self.adjacency = [[] for _ in range(stock_cnt)]  # [[related stock index, ...] by highest value, ...]
+        self.cull(self.threshold, self.topK)
+
+    def cull(self, threshold: float, topK: int = 0) -> None:
+        """
+        Chooses edges to draw: relations with normalized value of at least threshold which are among the topK
+        relations of either stock.
+
+        :param threshold: minimum normalized relation value in [0, 1]
+        :param topK: number of highest relations kept per stock, 0 to keep all
+        :return: None
+        """
+        self.threshold = float(threshold)
+        self.topK = int(topK)
+
+        with np.errstate(invalid='ignore'):
+            keep = self.normalized >= self.threshold
+        order = np.argsort(-np.nan_to_num(self.normalized, nan=-np.inf), axis=1, kind='stable')
+        if 0 < self.topK < len(order):
+            top = np.zeros_like(keep)
+            np.put_along_axis(top, order[:, :self.topK], True, axis=1)
+            keep &= top | top.T
+
+        (first, second) = np.nonzero(np.triu(keep, 1))
+        by_value = np.argsort(self.normalized[first, second], kind='stable')  # strongest edges drawn last
+        self.first, self.second = first[by_value], second[by_value]
+        self.adjacency = [order[i][keep[i][order[i]]].tolist() for i in range(len(order))]
+
+    def edgeImage(self) -> str:
+        """
+        Renders edges chosen by self.cull() method into a transparent image the size of the drawing area.
+
+        :return: base64 encoded PNG image, for tkinter.PhotoImage(data=...)
+        """
+        key = (self.threshold, self.topK)
+        if key in self.images:
+            self.images.move_to_end(key)
+            return self.images[key]
+
+        dpi = 100
+        fig = Figure(figsize=(self.width / dpi, self.height / dpi), dpi=dpi)
+        fig.patch.set_alpha(0)
+        ax = fig.add_axes((0, 0, 1, 1))
+        ax.set_xlim(0, self.width)
+        ax.set_ylim(self.height, 0)
+        ax.axis('off')
+
+        values = self.normalized[self.first, self.second]
+        colors = np.column_stack([np.zeros(len(values)), values, values, np.ones(len(values))])
+        segments = np.stack([self.positions[self.first], self.positions[self.second]], axis=1)
+        ax.add_collection(LineCollection(segments, colors=colors, linewidths=72 / dpi))  # 1 pixel wide
+
+        buffer = BytesIO()
+        FigureCanvasAgg(fig).print_png(buffer)
+        self.images[key] = base64.b64encode(buffer.getvalue()).decode('ascii')
+        while len(self.images) > self.cacheSize:
+            self.images.popitem(last=False)
+        return self.images[key]
+
+    def nodeAt(self, x: float, y: float) -> int | None:
+        """
+        Finds stock drawn at given position.
+
+        :param x: x-coordinate in drawing area
+        :param y: y-coordinate in drawing area
+        :return: stock index, None if no stock is drawn there
+        """
+        return self.grid.nearest(x, y, self.nodeWidth / 2)
@@ -0,0 +1,93 @@
+import sqlite3
+import numpy as np
+from itertools import count
+
+
+class RelationStore:
+    """
+    RelationStore class that keeps the Relations table in memory, addressed by stock index instead of
+    "company1, company2" strings.
+    The whole table is read with a single query into a (stock x stock) relation matrix with its bounds. Keyword
+    similarity blocks are parsed from their stored strings once, when first requested.
+    """
+
+    loadCount = count(1)  # numbers every loaded store, see self.version
+
+    def __init__(self, cur: sqlite3.Cursor, stockList: list):
+        """
+        Class constructor.
+        Loads relation values & keyword similarity strings of all given stock pairs.
+
+        :param cur: cursor for SQL Database containing Relations table
+        :param stockList: list of Stock objects, defining stock indices
+        """
+        self.version = next(RelationStore.loadCount)  # differs between loads, for caches of data derived from store
+        self.stockIdx = {stockList[i].companyName: i for i in range(len(stockList))}
+
+        self.values = np.full((len(stockList), len(stockList)), np.nan)  # NaN for pairs without relation value
+        self.blockText = dict()  # {(i, j): "value1, value2, ..."}
+        self.blocks = dict()  # {(i, j): (keyword x keyword) similarity block}, parsed on first request
+
+        cur.execute("select * from Relations;")
+        for (companies, keywordRelations, finalValue) in cur.fetchall():
+            pair = self.__pairIndices(companies)
+            if pair is not None and pair[0] != pair[1]:
+                self.values[pair] = float(finalValue)
+                self.blockText[pair] = keywordRelations
+
+        known = ~np.isnan(self.values)
+        self.minRelation = float(self.values[known].min()) if known.any() else 0.0
+        self.maxRelation = float(self.values[known].max()) if known.any() else 0.0
+
+    def __pairIndices(self, companies: str) -> tuple | None:
+        """
+        Helper method for constructor.
+        Splits "company1, company2" key into stock indices, trying every ", " in case company names contain one.
+
+        :param companies: Relations table key
+        :return: (stock index 1, stock index 2), None if either company is not in stock list
+        """
+        pos = companies.find(", ")
+        while pos >= 0:
+            first = self.stockIdx.get(companies[:pos])
+            second = self.stockIdx.get(companies[pos + 2:])
+            if first is not None and second is not None:
+                return first, second
+            pos = companies.find(", ", pos + 1)
+        return None
+
+    def relation(self, i: int, j: int) -> float:
+        """
+        Gives relation value between two stocks.
+
+        :param i: first stock index
+        :param j: second stock index
+        :return: relation value, NaN if unknown
+        """
+        return float(self.values[i, j])
+
+    def row(self, i: int) -> np.ndarray:
+        """
+        Gives relation values of a stock with every other stock.
+
+        :param i: stock index
+        :return: relation values of all other stocks, in stock order without stock i
+        """
+        return np.delete(self.values[i], i)
+
+    def keywordBlock(self, i: int, j: int) -> np.ndarray | None:
+        """
+        Gives similarity of every keyword pair between two stocks.
+
+        :param i: first stock index
+        :param j: second stock index
+        :return: (keyword x keyword) similarity block, None if unknown
+        """
+        if (i, j) not in self.blocks:
+            text = self.blockText.get((i, j))
+            if not text:
+                return None
+            values = np.array(text.split(", "), dtype=np.float64)
+            keyword_cnt = int(round(np.sqrt(len(values))))
+            self.blocks[(i, j)] = values.reshape(keyword_cnt, keyword_cnt)
+        return self.blocks[(i, j)]
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+
+class Report:
+    """
+    Report static class for writing analysis results of all stocks into files (CSV, JSON or Parquet).
+    """
+
+    FORMATS = ('csv', 'json', 'parquet')
+
+    @staticmethod
+    def predictionTable(stockList: list, timePeriod: list, predictions: list) -> pd.DataFrame:
+        """
+        Tabulates most recent change, change importance & prediction of every stock, one row per stock & time period.
+
+        :param stockList: list of analyzed Stock objects
+        :param timePeriod: time periods [(interval, period), ...]
+        :param predictions: predictions per time period (see PredictionEngine.predictAll() method)
+        :return: prediction DataFrame
+        """
+        rows = []
+        for h in range(len(predictions)):
+            (prediction, percent, related) = predictions[h]
+            for i in range(len(stockList)):
+                stock = stockList[i]
+                rows.append({
+                    'Ticker': stock.stockName,
+                    'Company': stock.companyName,
+                    'Interval': timePeriod[h][0],
+                    'Period': timePeriod[h][1],
+                    'Price': float(stock.stockData[h][-1]),
+                    'Change': float(stock.stockChangeData[h][-1]),
+                    'Change_Pct': float(stock.stockChangeData[h][-1] / stock.stockData[h][-2] * 100),
+                    'Significant': bool(stock.changeImportance[h]),
+                    'Predicted_Change': float(prediction[i]),
+                    'Predicted_Pct': float(percent[i]),
+                    'Related_Companies': [stockList[j].companyName for j in related[i]]
+                })
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def relationTable(stockList: list, relations: np.ndarray, normalized: np.ndarray) -> pd.DataFrame:
+        """
+        Tabulates relation value of every stock pair with a known relation, one row per direction.
+
+        :param stockList: list of Stock objects
+        :param relations: (stock x stock) relation values (see RelationStore.py)
+        :param normalized: (stock x stock) normalized relation values (see PredictionEngine.py)
+        :return: relation DataFrame
+        """
+        (first, second) = np.nonzero(~np.isnan(relations))
+        return pd.DataFrame({
+            'Ticker': [stockList[i].stockName for i in first],
+            'Company': [stockList[i].companyName for i in first],
+            'Related_Ticker': [stockList[j].stockName for j in second],
+            'Related_Company': [stockList[j].companyName for j in second],
+            'Relation': relations[first, second],
+            'Normalized_Relation': normalized[first, second]
+        })
+
+    @staticmethod
+    def write(table: pd.DataFrame, path: str) -> None:
+        """
+        Writes table into file of format given by file extension. The file is written under a temporary name and
+        then renamed, so readers never see a partially written file.
+
+        :param table: DataFrame to write
+        :param path: output file path ending with .csv, .json or .parquet
+        :return: None
+        """
+        fileFormat = os.path.splitext(path)[1][1:].lower()
+        if fileFormat not in Report.FORMATS:
+            raise ValueError(f"Unsupported report format: {path}")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        (fd, tmp_path) = tempfile.mkstemp(dir=directory, suffix=f".{fileFormat}.tmp")
+        os.close(fd)
+        try:
+            if fileFormat == 'csv':
+                # list columns are joined, as CSV has no list type
+                table = table.apply(lambda column: column.map(
+                    lambda value: "; ".join(value) if isinstance(value, list) else value))
+                table.to_csv(tmp_path, index=False)
+            elif fileFormat == 'json':
+                table.to_json(tmp_path, orient='records', indent=1)
+            else:
+                table.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
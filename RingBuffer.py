@@ -0,0 +1,75 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    RingBuffer class that keeps the most recent values of a series in fixed-capacity storage.
+    Every value is written twice (at i and i + capacity), so the buffer's contents in chronological order are always
+    one contiguous slice, readable as a NumPy view without copying.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float64):
+        """
+        Class constructor.
+
+        :param capacity: maximum number of stored values, older values are overwritten
+        :param dtype: NumPy data type of values
+        """
+        self.capacity = max(capacity, 1)
+        self.data = np.zeros(self.capacity * 2, dtype=dtype)
+        self.start = 0  # position of oldest value
+        self.size = 0
+
+    def __len__(self) -> int:
+        """
+        :return: number of stored values
+        """
+        return self.size
+
+    def append(self, value) -> None:
+        """
+        Appends value, overwriting the oldest value if buffer is full.
+
+        :param value: new value
+        :return: None
+        """
+        if self.size < self.capacity:
+            pos = self.start + self.size
+            self.size += 1
+        else:
+            pos = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.data[pos] = self.data[pos + self.capacity] = value
+
+    def extend(self, values: np.ndarray) -> None:
+        """
+        Appends all given values in order.
+
+        :param values: new values, oldest first
+        :return: None
+        """
+        if len(values) >= self.capacity:
+            self.data[:self.capacity] = self.data[self.capacity:] = values[-self.capacity:]
+            self.start = 0
+            self.size = self.capacity
+            return
+        for value in values:
+            self.append(value)
+
+    def setLast(self, value) -> None:
+        """
+        Overwrites the most recent value.
+
+        :param value: new value
+        :return: None
+        """
+        pos = (self.start + self.size - 1) % self.capacity
+        self.data[pos] = self.data[pos + self.capacity] = value
+
+    def view(self) -> np.ndarray:
+        """
+        Gives stored values in chronological order. The view is only valid until the next append.
+
+        :return: NumPy view of stored values, oldest first
+        """
+        return self.data[self.start: self.start + self.size]
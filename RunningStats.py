@@ -0,0 +1,157 @@
+import numpy as np
+
+
+class RunningStats:
+    """
+    RunningStats class that keeps mean & standard deviation of many value streams (ex. one per stock) at once.
+    Every pushed value updates its stream in O(1), with Welford's algorithm (all values weighted equally) or as
+    exponentially weighted moving average (recent values weighted more).
+    The most recently pushed value of each stream is held back, so it can be compared against all values before it.
+    """
+
+    def __init__(self, size: int = 1, halfLife: float = None):
+        """
+        Class constructor.
+
+        :param size: number of value streams
+        :param halfLife: number of values after which a value's weight is halved, None for equal weights (Welford)
+        """
+        self.halfLife = halfLife
+        self.alpha = None if halfLife is None else 1 - 0.5 ** (1 / halfLife)
+
+        self.count = np.zeros(size, dtype=np.int64)  # number of values included in statistics
+        self.mean = np.zeros(size, dtype=np.float64)
+        self.m2 = np.zeros(size, dtype=np.float64)  # sum of squared deviations (Welford) or variance (EWMA)
+        self.last = np.full(size, np.nan)  # most recent value, not yet included in statistics
+
+    @staticmethod
+    def fromHistories(histories: list, halfLife: float = None) -> 'RunningStats':
+        """
+        Builds statistics of one stream per given history, pushing all histories together one step at a time.
+
+        :param histories: [[value1, value2, ...], ...] per stream, oldest value first
+        :param halfLife: number of values after which a value's weight is halved, None for equal weights (Welford)
+        :return: RunningStats object
+        """
+        stats = RunningStats(len(histories), halfLife)
+        length = max([len(history) for history in histories], default=0)
+
+        # right-aligned, so the most recent value of every stream is pushed last
+        steps = np.full((length, len(histories)), np.nan)
+        for i in range(len(histories)):
+            if len(histories[i]) > 0:
+                steps[length - len(histories[i]):, i] = histories[i]
+
+        for values in steps:
+            stats.push(values)
+        return stats
+
+    def push(self, values: np.ndarray) -> None:
+        """
+        Pushes one new value into every stream. The previous most recent value of each stream is folded into its
+        statistics.
+
+        :param values: new value per stream, NaN for streams without a new value
+        :return: None
+        """
+        values = np.asarray(values, dtype=np.float64)
+        new = ~np.isnan(values)
+        fold = new & ~np.isnan(self.last)
+
+        x = self.last[fold]
+        delta = x - self.mean[fold]
+        if self.alpha is None:
+            self.count[fold] += 1
+            self.mean[fold] += delta / self.count[fold]
+            self.m2[fold] += delta * (x - self.mean[fold])
+        else:
+            first = self.count[fold] == 0
+            self.count[fold] += 1
+            self.mean[fold] = np.where(first, x, self.mean[fold] + self.alpha * delta)
+            self.m2[fold] = np.where(first, 0.0, (1 - self.alpha) * (self.m2[fold] + self.alpha * delta ** 2))
+
+        self.last[new] = values[new]
+
+    def remove(self, values: np.ndarray) -> None:
+        """
+        Removes one value from the statistics of every stream in O(1) (ex. when it left a stream's window), reversing
+        Welford's algorithm. Only equally weighted statistics can be reversed, see self.reset() method otherwise.
+
+        :param values: value per stream included in its statistics, NaN for streams to keep
+        :return: None
+        """
+        if self.alpha is not None:
+            raise ValueError("values can only be removed from equally weighted statistics")
+        values = np.asarray(values, dtype=np.float64)
+        old = ~np.isnan(values) & (self.count > 0)
+
+        x = values[old]
+        mean = self.mean[old]
+        count = self.count[old] - 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            new_mean = np.where(count > 0, mean - (x - mean) / count, 0.0)
+        self.m2[old] = np.where(count > 0, np.maximum(self.m2[old] - (x - mean) * (x - new_mean), 0.0), 0.0)
+        self.mean[old] = new_mean
+        self.count[old] = count
+
+    def reset(self, idx: int, history: np.ndarray) -> None:
+        """
+        Rebuilds statistics of a single stream from given history, in place (see self.row() method).
+
+        :param idx: index of stream
+        :param history: [value1, value2, ...] of stream, oldest value first
+        :return: None
+        """
+        stats = RunningStats.fromHistories([history], self.halfLife)
+        self.count[idx] = stats.count[0]
+        self.mean[idx] = stats.mean[0]
+        self.m2[idx] = stats.m2[0]
+        self.last[idx] = stats.last[0]
+
+    def replaceLast(self, values: np.ndarray) -> None:
+        """
+        Replaces most recent value of every stream (ex. when a bar still in progress was updated).
+        Statistics are unaffected, as the most recent value is not included in them yet.
+
+        :param values: replacement value per stream, NaN for streams to keep
+        :return: None
+        """
+        values = np.asarray(values, dtype=np.float64)
+        replace = ~np.isnan(values)
+        self.last[replace] = values[replace]
+
+    def std(self) -> np.ndarray:
+        """
+        Calculates standard deviation of every stream.
+
+        :return: standard deviation per stream, NaN for streams with less than two values
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = self.m2 / (self.count - 1) if self.alpha is None else self.m2.copy()
+        variance[self.count < 2] = np.nan
+        return np.sqrt(variance)
+
+    def isSignificant(self) -> np.ndarray:
+        """
+        Checks if most recent value of every stream lies outside one standard deviation of all values before it.
+
+        :return: bool per stream, False for streams with less than two values before the most recent one
+        """
+        std = self.std()
+        with np.errstate(invalid='ignore'):
+            inside = (self.mean - std <= self.last) & (self.last <= self.mean + std)
+        return ~inside & ~np.isnan(std) & ~np.isnan(self.last)
+
+    def row(self, idx: int) -> 'RunningStats':
+        """
+        Gives statistics of a single stream, sharing memory with this object.
+
+        :param idx: index of stream
+        :return: RunningStats object of size 1 whose updates also update this object
+        """
+        stats = RunningStats(0, self.halfLife)
+        stats.count = self.count[idx: idx + 1]
+        stats.mean = self.mean[idx: idx + 1]
+        stats.m2 = self.m2[idx: idx + 1]
+        stats.last = self.last[idx: idx + 1]
+        return stats
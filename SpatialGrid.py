@@ -0,0 +1,53 @@
+import numpy as np
+from math import floor
+
+
+class SpatialGrid:
+    """
+    SpatialGrid class that indexes 2D points in square grid cells, so that finding the point under a position only
+    checks points of nearby cells instead of every point.
+    """
+
+    def __init__(self, points: np.ndarray, cellSize: float):
+        """
+        Class constructor.
+
+        :param points: (point x 2) point coordinates
+        :param cellSize: side length of grid cells, ideally around the hit radius
+        """
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.cellSize = max(float(cellSize), 1e-9)
+        self.cells = dict()  # {(cell x, cell y): [point index, ...]}
+        for i in range(len(self.points)):
+            self.cells.setdefault(self.__cell(self.points[i][0], self.points[i][1]), []).append(i)
+
+    def __cell(self, x: float, y: float) -> tuple:
+        """
+        Helper method for constructor and self.nearest() method.
+
+        :param x: x-coordinate
+        :param y: y-coordinate
+        :return: (cell x, cell y) containing position
+        """
+        return floor(x / self.cellSize), floor(y / self.cellSize)
+
+    def nearest(self, x: float, y: float, radius: float) -> int | None:
+        """
+        Finds point closest to given position within radius.
+
+        :param x: x-coordinate
+        :param y: y-coordinate
+        :param radius: maximum distance of found point
+        :return: point index, None if no point is within radius
+        """
+        (cell_x, cell_y) = self.__cell(x, y)
+        reach = int(np.ceil(radius / self.cellSize))
+
+        candidates = [i for dx in range(-reach, reach + 1) for dy in range(-reach, reach + 1)
+                      for i in self.cells.get((cell_x + dx, cell_y + dy), [])]
+        if len(candidates) == 0:
+            return None
+
+        distances = np.hypot(self.points[candidates, 0] - x, self.points[candidates, 1] - y)
+        closest = int(np.argmin(distances))
+        return candidates[closest] if distances[closest] <= radius else None
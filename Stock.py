@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class Stock:
     """
     Stock class that holds relevant stock information.
@@ -19,8 +22,39 @@ class Stock:
         self.keywordRel = dict()  # {Stock: [[(word2_1) num, (word2_2) num, ...], [], [], ...]}
         self.RelSentimentScore = dict()  # {Stock: float}
 
-        self.stockDataShort = list()  # [price1, price2, ...]
-        self.stockDataLong = list()  # [price1, price2, ...]
-        self.stockChangeDataShort = list()
-        self.stockChangeDataLong = list()
-        self.changeImportance = [False, False]
+        # one entry per time period (horizon), from shortest to longest
+        self.stockData = []  # [[price1, price2, ...], ...] views of self.priceBuffers
+        self.stockChangeData = []  # [[price2 - price1, ...], ...] views of self.changeBuffers
+        self.priceBuffers = []  # [RingBuffer, ...]
+        self.changeBuffers = []  # [RingBuffer, ...]
+        self.lastBarTime = []  # [time of most recent bar, ...]
+        self.changeImportance = []  # [bool, ...]
+        self.changeStats = []  # [RunningStats, ...] of all changes
+
+    @property
+    def stockDataShort(self) -> np.ndarray:
+        """
+        Price data of the shortest time period.
+        """
+        return self.stockData[0] if len(self.stockData) > 0 else np.empty(0, dtype=np.float64)
+
+    @property
+    def stockDataLong(self) -> np.ndarray:
+        """
+        Price data of the longest time period.
+        """
+        return self.stockData[-1] if len(self.stockData) > 0 else np.empty(0, dtype=np.float64)
+
+    @property
+    def stockChangeDataShort(self) -> np.ndarray:
+        """
+        Change data of the shortest time period.
+        """
+        return self.stockChangeData[0] if len(self.stockChangeData) > 0 else np.empty(0, dtype=np.float64)
+
+    @property
+    def stockChangeDataLong(self) -> np.ndarray:
+        """
+        Change data of the longest time period.
+        """
+        return self.stockChangeData[-1] if len(self.stockChangeData) > 0 else np.empty(0, dtype=np.float64)
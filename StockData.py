@@ -1,7 +1,11 @@
 from Stock import Stock
+from PriceProvider import periodOffset, intervalRule, intervalLength, intervalHistory
+from RunningStats import RunningStats
+from RingBuffer import RingBuffer
 
+import numpy as np
+import pandas as pd
 import yfinance as yf
-from statistics import mean, stdev
 
 
 class StockData:
@@ -10,72 +14,265 @@ class StockData:
     """
 
     @staticmethod
-    def retrieveData(stock: Stock, short_term: tuple, long_term: tuple) -> bool:
+    def retrieveAllData(stockList: list, horizons: list, provider) -> dict:
         """
-        Retrieves all stock data for given stock object based on given two time periods.
+        Retrieves all stock data for every given stock object based on given time periods (horizons).
+        Price bars are downloaded once for all stocks at the finest interval over the longest period through the
+        given price provider, every horizon is then resampled locally from them.
+
+        :param stockList: list of Stock objects
+        :param horizons: list of time periods [(interval, period), ...]
+        :param provider: price provider (see PriceProvider.py)
+        :return: {stock name: failure reason} for stocks whose data could not be collected
+        """
+        base = StockData.baseHorizon(horizons)
+        frames, failures = provider.history([stock.stockName for stock in stockList], base[0], base[1])
+
+        for stock in stockList:
+            if stock.stockName in failures:
+                continue
+            if not StockData.loadData(stock, StockData.resampleData(frames[stock.stockName], base[0], horizons)):
+                failures[stock.stockName] = "empty price data"
+        return failures
+
+    @staticmethod
+    def retrieveData(stock: Stock, horizons: list) -> bool:
+        """
+        Retrieves all stock data for given stock object based on given time periods (horizons).
 
         :param stock: selected Stock object
-        :param short_term: short term time period (interval, period)
-        :param long_term: long term time period (interval, period)
+        :param horizons: list of time periods [(interval, period), ...]
         :return: True if all stock data successfully collected, False otherwise
         """
-        data = yf.Ticker(stock.stockName)
-        stock_df_short = data.history(interval=short_term[0], period=short_term[1], auto_adjust=False)
-        stock_df_long = data.history(interval=long_term[0], period=long_term[1], auto_adjust=False)
-        stock_df_short = stock_df_short.fillna(method='ffill')
-        stock_df_long = stock_df_long.fillna(method='ffill')
+        base = StockData.baseHorizon(horizons)
+        stock_df = yf.Ticker(stock.stockName).history(interval=base[0], period=base[1], auto_adjust=False)
+        return StockData.loadData(stock, StockData.resampleData(stock_df, base[0], horizons))
 
-        for i in stock_df_short.index:
-            stock.stockDataShort.append((stock_df_short.loc[i]['High'] + stock_df_short.loc[i]['Low']) / 2)
-        for i in stock_df_long.index:
-            stock.stockDataLong.append((stock_df_long.loc[i]['High'] + stock_df_long.loc[i]['Low']) / 2)
+    @staticmethod
+    def baseHorizon(horizons: list) -> tuple:
+        """
+        Finds single time period that all given time periods can be resampled from.
+        Yahoo Finance only serves intraday bars for a limited history (see PriceProvider.intervalHistory()), so the
+        finest interval must be available over the longest period.
 
-        if len(stock.stockDataShort) == 0 or len(stock.stockDataLong) == 0:
-            return False
+        :param horizons: list of time periods [(interval, period), ...]
+        :return: (finest interval, longest period)
+        """
+        now = pd.Timestamp.now()
+        interval = min([horizon[0] for horizon in horizons], key=intervalLength)
+        period = max([horizon[1] for horizon in horizons], key=lambda p: now + periodOffset(p))
 
-        # short term data
-        for i in range(1, len(stock.stockDataShort)):
-            stock.stockChangeDataShort.append(stock.stockDataShort[i] - stock.stockDataShort[i - 1])
+        limit = intervalHistory(interval)
+        if limit is not None:
+            too_long = [horizon for horizon in horizons if now - (now - periodOffset(horizon[1])) > limit]
+            if len(too_long) > 0:
+                finest = [horizon for horizon in horizons if intervalLength(horizon[0]) == intervalLength(interval)]
+                raise ValueError(
+                    f"Time periods {too_long} are longer than the {limit.days} days of '{interval}' bars that Yahoo "
+                    f"Finance serves, which time periods {finest} need to be resampled from. Shorten these time "
+                    f"periods or use a coarser interval.")
+        return interval, period
 
-        # long term data
-        for i in range(1, len(stock.stockDataLong)):
-            stock.stockChangeDataLong.append(stock.stockDataLong[i] - stock.stockDataLong[i - 1])
+    @staticmethod
+    def resampleData(stock_df: pd.DataFrame, interval: str, horizons: list) -> list:
+        """
+        Resamples price bars of given interval into every given time period.
 
-        print(
-            f"Stock: {stock.companyName}\n"
-            f"{stock_df_short.head}\n"
-            f"Short Data: {stock.stockDataShort}\n"
-            f"{stock_df_long.head}\n"
-            f"Long Data: {stock.stockDataLong}"
-        )
+        :param stock_df: OHLCV DataFrame of the finest interval
+        :param interval: bar interval of stock_df
+        :param horizons: list of time periods [(interval, period), ...]
+        :return: [OHLCV DataFrame, ...] per time period
+        """
+        aggregation = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Adj Close': 'last',
+                       'Volume': 'sum'}
+        aggregation = {column: aggregation[column] for column in stock_df.columns if column in aggregation}
+
+        horizon_dfs = []
+        for (horizon_interval, period) in horizons:
+            horizon_df = stock_df
+            if horizon_interval != interval:
+                horizon_df = stock_df.resample(intervalRule(horizon_interval), label='left', closed='left').agg(
+                    aggregation).dropna(subset=['High', 'Low'], how='all')
+            if len(horizon_df) > 0:
+                horizon_df = horizon_df[horizon_df.index > horizon_df.index[-1] - periodOffset(period)]
+            horizon_dfs.append(horizon_df)
+        return horizon_dfs
+
+    @staticmethod
+    def loadData(stock: Stock, stock_dfs: list) -> bool:
+        """
+        Loads stock data for given stock object from price DataFrames of every time period.
+        Prices & changes are kept in ring buffers sized to the loaded time periods, so later updates
+        (see self.updateAllData() method) keep each time period's length fixed.
+
+        :param stock: selected Stock object
+        :param stock_dfs: [OHLCV DataFrame, ...] per time period
+        :return: True if all stock data successfully loaded, False otherwise
+        """
+        # mid-prices as contiguous float64 arrays
+        stock_dfs = [stock_df.ffill() for stock_df in stock_dfs]
+        prices = [((stock_df['High'] + stock_df['Low']) / 2).to_numpy(dtype=np.float64) for stock_df in stock_dfs]
+
+        if any([len(data) == 0 for data in prices]):
+            return False
+
+        stock.priceBuffers = [RingBuffer(len(data)) for data in prices]
+        stock.changeBuffers = [RingBuffer(len(data) - 1) for data in prices]
+        for h in range(len(prices)):
+            stock.priceBuffers[h].extend(prices[h])
+            # change data
+            stock.changeBuffers[h].extend(np.diff(prices[h]))
+        stock.lastBarTime = [stock_df.index[-1] for stock_df in stock_dfs]
+        StockData.__refreshViews(stock)
 
         return True
 
     @staticmethod
-    def analyzeStockData(stock: Stock) -> bool:
+    def updateAllData(stockList: list, changeStats: list, updates: dict) -> set:
+        """
+        Merges newly polled prices (see PriceFeed.py) into stock data of all given stock objects & re-analyzes only
+        the stocks whose stock data changed. Changes that leave a stock's ring buffer also leave its change
+        statistics, so they always cover the same changes as a fresh analysis (see self.analyzeAllStockData()).
+
+        :param stockList: list of analyzed Stock objects, in order of change statistics streams
+        :param changeStats: [RunningStats, ...] per time period (see self.analyzeAllStockData() method)
+        :param updates: {stock name: [mid-price Series of bars from the most recent known bar onwards, ...] per time
+        period}
+        :return: set of indices (in stockList) of changed stocks
         """
-        Analyzes collected stock data for selected stock object to determine significance.
+        changed = set()
+        replaced = [np.full(len(stockList), np.nan) for h in range(len(changeStats))]
+        new_changes = [[[] for stock in stockList] for h in range(len(changeStats))]
+        evicted = [[[] for stock in stockList] for h in range(len(changeStats))]
+
+        for i in range(len(stockList)):
+            if stockList[i].stockName not in updates:
+                continue
+            prices = updates[stockList[i].stockName]
+            for h in range(len(changeStats)):
+                if len(prices[h]) == 0:
+                    continue
+                replaced[h][i], new_changes[h][i], evicted[h][i] = StockData.__mergeBars(stockList[i], h, prices[h])
+                if not np.isnan(replaced[h][i]) or len(new_changes[h][i]) > 0:
+                    changed.add(i)
+
+        for i in changed:
+            StockData.__refreshViews(stockList[i])
+
+        # new changes of all stocks are pushed together, one per stock at a time
+        for h in range(len(changeStats)):
+            changeStats[h].replaceLast(replaced[h])
+            for k in range(max([len(changes) for changes in new_changes[h]], default=0)):
+                changeStats[h].push(
+                    [changes[k] if k < len(changes) else np.nan for changes in new_changes[h]])
+            if changeStats[h].alpha is None:
+                for k in range(max([len(changes) for changes in evicted[h]], default=0)):
+                    changeStats[h].remove([changes[k] if k < len(changes) else np.nan for changes in evicted[h]])
+            else:
+                # exponentially weighted statistics cannot drop a single value, so they are rebuilt from the window
+                for i in range(len(stockList)):
+                    if len(evicted[h][i]) > 0:
+                        changeStats[h].reset(i, stockList[i].changeBuffers[h].view())
+            significant = changeStats[h].isSignificant()
+            for i in changed:
+                stockList[i].changeImportance[h] = bool(significant[i])
+        return changed
+
+    @staticmethod
+    def __mergeBars(stock: Stock, h: int, prices: pd.Series) -> tuple:
+        """
+        Sub method for self.updateAllData() method.
+        Updates stock's most recent bar of given time period if it was still in progress & appends all newer bars.
+
+        :param stock: selected Stock object
+        :param h: index of time period
+        :param prices: mid-price Series of time period, indexed by bar time
+        :return: (replaced most recent change or NaN, [new change, ...], [change evicted from ring buffer, ...])
+        """
+        times = prices.index
+        prices = prices.to_numpy(dtype=np.float64)
+        priceBuffer = stock.priceBuffers[h]
+        changeBuffer = stock.changeBuffers[h]
+
+        replaced = np.nan
+        current = prices[times == stock.lastBarTime[h]]
+        if len(current) > 0 and not np.isnan(current[-1]) and current[-1] != priceBuffer.view()[-1]:
+            priceBuffer.setLast(current[-1])
+            if len(priceBuffer) > 1:
+                replaced = current[-1] - priceBuffer.view()[-2]
+                changeBuffer.setLast(replaced)
+
+        new_changes = []
+        evicted = []
+        for price in prices[times > stock.lastBarTime[h]]:
+            if np.isnan(price):
+                continue
+            new_changes.append(price - priceBuffer.view()[-1])
+            priceBuffer.append(price)
+            if len(changeBuffer) == changeBuffer.capacity:
+                evicted.append(changeBuffer.view()[0])
+            changeBuffer.append(new_changes[-1])
+        if len(new_changes) > 0:
+            stock.lastBarTime[h] = times[-1]
+        return replaced, new_changes, evicted
+
+    @staticmethod
+    def __refreshViews(stock: Stock) -> None:
+        """
+        Helper method for self.loadData() and self.updateAllData() methods.
+        Points stock data of given stock object at the current contents of its ring buffers.
+
+        :param stock: selected Stock object
+        :return: None
+        """
+        stock.stockData = [buffer.view() for buffer in stock.priceBuffers]
+        stock.stockChangeData = [buffer.view() for buffer in stock.changeBuffers]
+
+    @staticmethod
+    def analyzeStockData(stock: Stock, halfLife: float = None) -> bool:
+        """
+        Analyzes collected stock data for selected stock object to determine significance in every time period.
 
         :param stock: selected Stock object
+        :param halfLife: half-life of change statistics in changes, None to weight all past changes equally
         :return: True if stock data exists & successful analysis, False otherwise
         """
-        if len(stock.stockChangeDataShort) == 0 or len(stock.stockChangeDataLong) == 0:
+        if not StockData.hasEnoughData(stock):
             return False
 
-        # short term
-        change_avg = mean(stock.stockChangeDataShort[:-1])
-        change_stdev = stdev(stock.stockChangeDataShort[:-1])
-        if change_avg - change_stdev <= stock.stockChangeDataShort[-1] <= change_avg + change_stdev:
-            stock.changeImportance[0] = False
-        else:
-            stock.changeImportance[0] = True
-
-        # long term
-        change_avg = mean(stock.stockChangeDataLong[:-1])
-        change_stdev = stdev(stock.stockChangeDataLong[:-1])
-        if change_avg - change_stdev <= stock.stockChangeDataLong[-1] <= change_avg + change_stdev:
-            stock.changeImportance[1] = False
-        else:
-            stock.changeImportance[1] = True
+        StockData.analyzeAllStockData([stock], halfLife)
 
         return True
+
+    @staticmethod
+    def hasEnoughData(stock: Stock) -> bool:
+        """
+        Checks if collected stock data of selected stock object can be analyzed.
+
+        :param stock: selected Stock object
+        :return: True if every time period has enough changes, False otherwise
+        """
+        # at least two past changes are needed for standard deviation
+        return len(stock.stockChangeData) > 0 and all([len(change) >= 3 for change in stock.stockChangeData])
+
+    @staticmethod
+    def analyzeAllStockData(stockList: list, halfLife: float = None) -> list:
+        """
+        Analyzes collected stock data of all given stock objects at once to determine significance of their most
+        recent change in every time period, compared to all past changes.
+        Keeps running change statistics per stock & time period (see RunningStats.py), so new changes can be
+        analyzed in O(1) by self.updateAllData() method.
+
+        :param stockList: list of Stock objects, each with enough stock data (see self.hasEnoughData() method)
+        :param halfLife: half-life of change statistics in changes, None to weight all past changes equally
+        :return: [RunningStats, ...] per time period, with one stream per stock in stockList order
+        """
+        horizon_cnt = min([len(stock.stockChangeData) for stock in stockList], default=0)
+        changeStats = [RunningStats.fromHistories([stock.stockChangeData[h] for stock in stockList], halfLife)
+                       for h in range(horizon_cnt)]
+        significant = [stats.isSignificant() for stats in changeStats]
+
+        for i in range(len(stockList)):
+            stockList[i].changeStats = [stats.row(i) for stats in changeStats]
+            stockList[i].changeImportance = [bool(significant[h][i]) for h in range(horizon_cnt)]
+        return changeStats
@@ -1,41 +1,52 @@
 from Stock import Stock
+from RelationStore import RelationStore
+from Animator import Animator
+from CanvasLayer import CanvasLayer
+from KeywordPlot import KeywordPlot
+from RelationNetwork import RelationNetwork
+from PredictionEngine import PredictionEngine
 
-import sqlite3
 import numpy as np
-import matplotlib as mpl
 import matplotlib.pyplot as plt
-from math import sin, cos, pi, floor, ceil, sqrt
+from math import floor, ceil, sqrt
 from tkinter import *
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from time import sleep
 
 
 class StockGUI:
-    def __init__(self, allStockList: list, timePeriod: tuple):
-        self.conn = sqlite3.connect("StockDatabase.db")
-        self.cur = self.conn.cursor()
-
+    def __init__(self, allStockList: list, timePeriod: list, relationStore: RelationStore,
+                 predictionEngine: PredictionEngine, pollUpdates=None, pollInterval: int = 1000):
+        """
+        Class constructor.
+
+        :param allStockList: list of analyzed Stock objects
+        :param timePeriod: time periods [(interval, period), ...] from shortest to longest
+        :param relationStore: relations of allStockList, shared by all views (see RelationStore.py)
+        :param predictionEngine: prediction engine over relations of allStockList (see PredictionEngine.py)
+        :param pollUpdates: callable merging live price updates, returning indices of changed stocks (live mode)
+        :param pollInterval: milliseconds between checks for live price updates
+        """
         self.allStockList = allStockList
         self.timePeriod = timePeriod
+        self.pollUpdates = pollUpdates
+        self.pollInterval = pollInterval
+        self.relationStore = relationStore
+        self.predictionEngine = predictionEngine
+        self.predictions = []  # [(change USD, change %, related stocks), ...] per time period, for all stocks
+
+        self.stockInc = []  # [short term increase (%), ...] per stock
+        self.stockIncItems = []  # [subFrame1 canvas text item, ...] per stock
+        self.focus = None  # (main_idx, subFrame2Args, subFrame3Args) of displayed focus details
+        self.subFrame1Canvas = None
+        self.relationNetwork = None  # layout & edge images of relation network Toplevel (see RelationNetwork.py)
+        self.animator = None  # schedules highlight animations on the Tkinter event loop
+        self.canvasLayers = dict()  # {canvas: CanvasLayer}, retained items of redrawn canvases
 
     def __findRelationBounds(self):
         # find company relation bounds
-        query = f"{self.allStockList[0].companyName}, {self.allStockList[1].companyName}"
-        self.cur.execute(f"select Final_Value from Relations where Companies = \'{query}\';")
-
         global maxRelScore, minRelScore
-        maxRelScore = minRelScore = float(self.cur.fetchone()[0])
-
-        for i in range(len(self.allStockList)):
-            for j in range(len(self.allStockList)):
-                if i != j:
-                    com1 = self.allStockList[i].companyName
-                    com2 = self.allStockList[j].companyName
-                    query = f"{com1}, {com2}"
-                    self.cur.execute(f"select Final_Value from Relations where Companies = \'{query}\';")
-                    result = float(self.cur.fetchone()[0])
-                    maxRelScore = max(maxRelScore, result)
-                    minRelScore = min(minRelScore, result)
+        maxRelScore = self.relationStore.maxRelation
+        minRelScore = self.relationStore.minRelation
 
     def runGUI(self) -> None:
         """
@@ -46,10 +57,12 @@ class StockGUI:
         """
 
         self.__findRelationBounds()
+        self.predictions = self.predictionEngine.predictAll(self.allStockList)
 
         global root
 
-        stock_inc = []
+        stock_inc = self.stockInc
+        stock_inc.clear()
         for stock in self.allStockList:
             stock_inc.append((stock.stockChangeDataShort[-1] / stock.stockDataShort[-2]) * 100)
 
@@ -64,7 +77,9 @@ class StockGUI:
         # tkinter
         root = Tk()
         root.title("Stock Prediction Program")
+        self.animator = Animator(root)
         root.geometry(f'{gui_width}x{gui_height}')
+        root.protocol("WM_DELETE_WINDOW", self.__closeGUI)
 
         allFrame = Frame(root, height=gui_height, width=gui_width)
         allFrame.place(relx=0.5, rely=0.5, anchor=CENTER)
@@ -100,6 +115,7 @@ class StockGUI:
         subFrame1Canvas.bind('<Leave>', lambda event: self.__unbound_to_mousewheel(event, subFrame1Canvas))
 
         subFrame1Canvas.config(yscrollcommand=canvasScrollbar.set)
+        self.subFrame1Canvas = subFrame1Canvas
         subFrame1Canvas.configure(scrollregion=subFrame1Canvas.bbox(ALL))
 
         # subframe1 canvas contents
@@ -123,9 +139,10 @@ class StockGUI:
                 stockColor = 'green'
             else:
                 stockColor = 'red'
-            subFrame1Canvas.create_text(canvas_col_x[2], canvas_head_height * 1.5 + i * canvas_row_height,
-                                        text="+" * ('-' not in str(stock_inc[i])) + f"{stock_inc[i]:.2f}%",
-                                        fill=stockColor, font=default_font)
+            self.stockIncItems.append(subFrame1Canvas.create_text(
+                canvas_col_x[2], canvas_head_height * 1.5 + i * canvas_row_height,
+                text="+" * ('-' not in str(stock_inc[i])) + f"{stock_inc[i]:.2f}%",
+                fill=stockColor, font=default_font))
 
             radio = Radiobutton(root, variable=mainStockVar, value=i + 1, width=0, bg='white')
             subFrame1Canvas.create_window(
@@ -273,7 +290,7 @@ class StockGUI:
             row=3, column=0, sticky=W, padx=text_padding)
 
         Label(
-            subFrame3TextFrame2Center, text=f"Long-Term ({self.timePeriod[1][0]}, {self.timePeriod[1][1]}): ",
+            subFrame3TextFrame2Center, text=f"Long-Term ({self.timePeriod[-1][0]}, {self.timePeriod[-1][1]}): ",
             font=default_font).grid(row=0, column=0, sticky=W, padx=text_padding)
         Label(subFrame3TextFrame2Center, text="Change Importance: ", font=default_font).grid(
             row=1, column=0, sticky=W, padx=text_padding)
@@ -307,8 +324,48 @@ class StockGUI:
         relatedLong = Label(subFrame3TextFrame2Center, text="", font=default_font, justify=LEFT)
         relatedLong.grid(row=3, column=1, sticky=W)
 
+        if self.pollUpdates is not None:
+            root.after(self.pollInterval, self.__refreshLive)
+
         root.mainloop()
 
+    def __refreshLive(self) -> None:
+        """
+        Helper method for self.runGUI() method.
+        Merges live price updates & redraws only the affected views: subFrame1 rows of changed stocks, and the focus
+        details (which depend on every stock) if any stock changed. Failed updates are reported, and it always
+        reschedules itself on the Tkinter event loop.
+
+        :return: None
+        """
+        try:
+            changed = self.pollUpdates()
+
+            for i in changed:
+                stock = self.allStockList[i]
+                self.stockInc[i] = (stock.stockChangeDataShort[-1] / stock.stockDataShort[-2]) * 100
+                if self.stockInc[i] >= 0:
+                    stockColor = 'green'
+                else:
+                    stockColor = 'red'
+                self.subFrame1Canvas.itemconfig(
+                    self.stockIncItems[i], text="+" * ('-' not in str(self.stockInc[i])) + f"{self.stockInc[i]:.2f}%",
+                    fill=stockColor)
+
+            if len(changed) > 0:
+                self.predictions = self.predictionEngine.predictAll(self.allStockList)
+
+            if len(changed) > 0 and self.focus is not None:
+                [main_idx, subFrame2Args, subFrame3Args] = self.focus
+                self.__updateSubFrame3(main_idx, subFrame3Args)
+                [subFrame2Canvas, parameters, stock_inc] = subFrame2Args
+                self.__updateSubFrame2(subFrame2Canvas, parameters, stock_inc, main_idx, animate=False)
+        except Exception as e:
+            print(f"Live update failed: {e!r}")
+        finally:
+            # a failed update must not end live mode
+            root.after(self.pollInterval, self.__refreshLive)
+
     def __bound_to_mousewheel(self, event, canvas: Canvas):
         """
         Helper event method for self.runStockGUI() method.
@@ -347,20 +404,12 @@ class StockGUI:
         """
         Sub method for self.runStockGUI.
         Creates Toplevel to display company relation results in diagram form using TKinter.
-        User can select two companies to visually see keyword relations in graph form.
+        User can select two companies (from menus or by clicking them) to visually see keyword relations in graph
+        form. Relations are drawn as one prerendered image of culled edges (see RelationNetwork.py), only the
+        relations of the company under the cursor are drawn live.
 
         :return: None
         """
-        # data
-        stockRelData = []
-        for i in range(0, len(self.allStockList) - 1):
-            for j in range(i + 1, len(self.allStockList)):
-                com1 = self.allStockList[i].companyName
-                com2 = self.allStockList[j].companyName
-                query = f"{com1}, {com2}"
-                self.cur.execute(f"select Final_Value from Relations where Companies = \'{query}\';")
-                stockRelData.append(float(self.cur.fetchone()[0]))
-
         # parameters
         canvas_width = 1000
         canvas_height = 950
@@ -370,12 +419,20 @@ class StockGUI:
         result_height = 800
 
         item_radius = 450
-        oval_width = 50
-        oval_height = 40
         oval_line_width = 2
         line_width = 1
         oval_color = "#C4E1FE"
 
+        # network layout & edge images are kept for later Toplevels
+        if self.relationNetwork is None:
+            self.relationNetwork = RelationNetwork(self.relationStore, canvas_width, canvas_height, item_radius)
+            # all relations for smaller networks, only the strongest ones otherwise
+            self.relationNetwork.cull(0.0, 0 if len(self.allStockList) <= 50 else 10)
+        network = self.relationNetwork
+        oval_width = network.nodeWidth
+        oval_height = network.nodeHeight
+        oval_line_width = oval_line_width if network.showLabels else 1
+
         # elements
         relResultWindow = Toplevel()
         relResultWindow.bind("<Escape>", lambda event: self.__destroyToplevel(event, relResultWindow))
@@ -413,30 +470,48 @@ class StockGUI:
         resultButton = Button(
             buttonFrame, text="Display Correlation Graph", width=20, command=lambda: self.__updateResultToplevel(
                 relResultWindow, com1, com2, [
-                    positions, boldItems, oval_width, oval_height, oval_color, displayCanvas, fig, resultCanvas
+                    positions, boldItems, oval_width, oval_height, oval_color, network.showLabels, displayCanvas,
+                    keywordPlot, heatmap
                 ]))
         resultButton.grid(row=0, column=2)
 
+        heatmap = BooleanVar(value=False)
+        heatmapCheck = Checkbutton(buttonFrame, text="Heatmap", variable=heatmap)
+        heatmapCheck.grid(row=0, column=3)
+
+        # edge culling
+        threshold = DoubleVar(value=network.threshold)
+        top_k = IntVar(value=network.topK)
+
+        Label(buttonFrame, text="Min. Relation").grid(row=1, column=0, sticky=E)
+        thresholdScale = Scale(
+            buttonFrame, variable=threshold, from_=0, to=1, resolution=0.05, orient=HORIZONTAL, length=160)
+        thresholdScale.grid(row=1, column=1)
+        Label(buttonFrame, text="Top Relations per Company (0: All)").grid(row=1, column=2, sticky=E)
+        topKSpinbox = Spinbox(buttonFrame, textvariable=top_k, from_=0, to=100, width=5)
+        topKSpinbox.grid(row=1, column=3, sticky=W)
+
         # items
-        positions = []
-        colorLines = []
+        positions = network.positions.tolist()
         boldItems = []
         stockOvals = []
-
-        center_xy = [canvas_width // 2, canvas_height // 2]
-        for i in range(len(self.allStockList)):
-            new_x = sin(2 * pi / len(self.allStockList) * i) * item_radius
-            new_y = -cos(2 * pi / len(self.allStockList) * i) * item_radius
-            positions.append([center_xy[0] + new_x, center_xy[1] + new_y])
-
-        idx = 0
-        for i in range(0, len(self.allStockList) - 1):
-            for j in range(i + 1, len(self.allStockList)):
-                colorLines.append(self.__drawColorLine(
-                    positions[i][0], positions[i][1],
-                    positions[j][0], positions[j][1],
-                    displayCanvas, line_width, stockRelData[idx]))
-                idx += 1
+        hoverState = [None]  # [stock index under cursor]
+
+        # edge layer image
+        edgeImageItem = displayCanvas.create_image(0, 0, anchor=NW, tags="edges")
+        cullArgs = [displayCanvas, edgeImageItem, threshold, top_k, hoverState]
+        self.__updateEdgeLayer(cullArgs)
+        thresholdScale.bind("<ButtonRelease-1>", lambda event: self.__updateEdgeLayer(cullArgs))
+        topKSpinbox.config(command=lambda: self.__updateEdgeLayer(cullArgs))
+        topKSpinbox.bind("<Return>", lambda event: self.__updateEdgeLayer(cullArgs))
+
+        # hover & click on companies
+        displayCanvas.bind("<Motion>", lambda event: self.__hoverNetwork(
+            event, displayCanvas, line_width, hoverState))
+        displayCanvas.bind("<Leave>", lambda event: self.__hoverNetwork(
+            None, displayCanvas, line_width, hoverState))
+        displayCanvas.bind("<Button-1>", lambda event: self.__selectNetworkNode(
+            event, com1, com2, resultButton))
 
         # draw ovals
         for pos in positions:
@@ -449,9 +524,10 @@ class StockGUI:
                     width=oval_line_width, fill=oval_color)
             )
 
-        # draw stock labels
-        for i in range(len(self.allStockList)):
-            displayCanvas.create_text(positions[i][0], positions[i][1], text=self.allStockList[i].companyName[:2])
+        # draw stock labels, if they fit on ovals
+        if network.showLabels:
+            for i in range(len(self.allStockList)):
+                displayCanvas.create_text(positions[i][0], positions[i][1], text=self.allStockList[i].companyName[:2])
 
         # result half
         resultFrame = Frame(allFrame, padx=25, pady=5)
@@ -461,13 +537,95 @@ class StockGUI:
         resultCanvas = FigureCanvasTkAgg(fig, master=resultFrame)
         resultCanvas.get_tk_widget().config(width=result_width, height=result_height)
         resultCanvas.get_tk_widget().pack(fill=BOTH, expand=True)
-        # resultCanvas.draw()
+        keywordPlot = KeywordPlot(fig, resultCanvas)
 
         relResultWindow.mainloop()
 
+    def __updateEdgeLayer(self, cullArgs: list) -> None:
+        """
+        Helper method for self.__displayResults() method.
+        Culls relation network edges with current settings & shows their (cached) image.
+
+        :param cullArgs: [displayCanvas, edge image item, threshold DoubleVar, top k IntVar, hover state]
+        :return: None
+        """
+        [displayCanvas, edgeImageItem, threshold, top_k, hoverState] = cullArgs
+        try:
+            self.relationNetwork.cull(threshold.get(), max(0, top_k.get()))
+        except TclError:
+            # unfinished Spinbox input
+            return
+
+        photo = PhotoImage(data=self.relationNetwork.edgeImage())
+        displayCanvas.itemconfig(edgeImageItem, image=photo)
+        displayCanvas.edgePhoto = photo  # Tk image is deleted together with its last reference
+
+        # hovered relations changed
+        displayCanvas.delete("hover")
+        hoverState[0] = None
+
+    def __hoverNetwork(self, event, displayCanvas: Canvas, line_width: int, hoverState: list) -> None:
+        """
+        Helper event method for self.__displayResults() method.
+        Draws culled relations & full name of company under cursor, removing those of previous company.
+
+        :param event: Tkinter motion event, None when cursor left canvas
+        :param displayCanvas: relation network canvas
+        :param line_width: relation line width
+        :param hoverState: [stock index under cursor], updated
+        :return: None
+        """
+        network = self.relationNetwork
+        idx = None if event is None else network.nodeAt(displayCanvas.canvasx(event.x), displayCanvas.canvasy(event.y))
+        if idx == hoverState[0]:
+            return
+        hoverState[0] = idx
+
+        displayCanvas.delete("hover")
+        if idx is None:
+            return
+
+        (x, y) = network.positions[idx]
+        for j in network.adjacency[idx]:
+            value = np.fmax(self.relationStore.relation(idx, j), self.relationStore.relation(j, idx))
+            line = self.__drawColorLine(
+                x, y, network.positions[j][0], network.positions[j][1], displayCanvas, line_width + 1, value)
+            displayCanvas.addtag_withtag("hover", line)
+
+        # relations below companies, above other relations
+        displayCanvas.tag_lower("hover")
+        displayCanvas.tag_lower("edges")
+        displayCanvas.create_text(
+            x, y - network.nodeHeight, text=self.allStockList[idx].companyName, fill='red', tags="hover")
+
+    def __selectNetworkNode(self, event, com1: StringVar, com2: StringVar, resultButton: Button) -> None:
+        """
+        Helper event method for self.__displayResults() method.
+        Selects clicked company as first company, or as second company after which both are displayed.
+
+        :param event: Tkinter click event
+        :param com1: first selected company name
+        :param com2: second selected company name
+        :param resultButton: button displaying selected companies
+        :return: None
+        """
+        canvas = event.widget
+        idx = self.relationNetwork.nodeAt(canvas.canvasx(event.x), canvas.canvasy(event.y))
+        if idx is None:
+            return
+
+        name = self.allStockList[idx].companyName
+        names = self.relationStore.stockIdx
+        if com1.get() in names and com2.get() not in names and com1.get() != name:
+            com2.set(name)
+            resultButton.invoke()
+        else:
+            com1.set(name)
+            com2.set("Select a Company (2)")
+
     def __drawColorLine(self, x1, y1, x2, y2, canvas, line_width, dataValue) -> list:
         """
-        Helper method for self.__displayResults() and self.__updateResultToplevel().
+        Helper method for self.__hoverNetwork() and self.__updateResultToplevel().
         Draws colored line on given canvas based on coordinates and given data value.
         Color is chosen based on global color/subdiv_num/maxRelSCore/minRelScore variables.
 
@@ -487,20 +645,23 @@ class StockGUI:
                                given_items: list) -> None:
         """
         Sub method for self.__displayResults method.
-        Updates Matplotlib Canvas Figure to display keyword relations for selected companies in 3d graph form.
+        Updates Matplotlib Canvas Figure to display keyword relations for selected companies in 3d graph or
+        heatmap form.
 
-        :param stockVars: List of Stock objects (companies) selected in Tkinter GUI
-        :param fig: Matplotlib figure containing FigureCanvasTkAgg subplot
-        :param resultCanvas: FigureCanvasTkAgg object to be updated
+        :param toplevel: Toplevel of relation results
+        :param com1: first selected company name
+        :param com2: second selected company name
+        :param given_items: diagram items, whether nodes are labeled, KeywordPlot of Toplevel & heatmap mode BooleanVar
         :return: None
         """
-        [positions, boldItems, oval_width, oval_height, oval_color, displayCanvas, fig, resultCanvas] = given_items
+        [positions, boldItems, oval_width, oval_height, oval_color, show_labels, displayCanvas, keywordPlot,
+         heatmap] = given_items
 
         # refresh everything
+        self.animator.cancel(toplevel)
         for item in boldItems:
             displayCanvas.delete(item)
         boldItems.clear()
-        fig.clf()
 
         # variable lists
         selectStocks = []
@@ -514,66 +675,18 @@ class StockGUI:
         if len(selectStocks) != 2:
             return
 
-        # print keywords
         stock1 = selectStocks[0]
         stock2 = selectStocks[1]
 
-        self.cur.execute(f"select * from Companies where Name = \'{stock1.companyName}\'")
-        result = self.cur.fetchone()
-        print(f"{stock1.companyName}: {result[1]}")
-
-        self.cur.execute(f"select * from Companies where Name = \'{stock2.companyName}\'")
-        result = self.cur.fetchone()
-        print(f"{stock2.companyName}: {result[1]}")
-
-        # update right figure plot
-        ax = fig.add_subplot(1, 1, 1, projection='3d')
-        ax.clear()
-        ax.set_xticks([i for i in range(self.keyword_cnt + 1)])
-        ax.set_yticks([i for i in range(self.keyword_cnt + 1)])
-        ax.set_zticks([0, 0.2, 0.4, 0.6, 0.8, 1])
-        ax.set_zlim(-0.2, 1.0)
+        keywordRel = self.relationStore.keywordBlock(selectIdx[0], selectIdx[1])
+        if keywordRel is None:
+            return
+        relScore = self.relationStore.relation(selectIdx[0], selectIdx[1])
 
-        # prepare data
-        stock1 = selectStocks[0]
-        stock2 = selectStocks[1]
-        companies = f"{stock1.companyName}, {stock2.companyName}"
-
-        self.cur.execute(f"select * from Relations where Companies = \'{companies}\'")
-        result = self.cur.fetchone()
-
-        relScore = float(result[2])
-        temp = list(map(float, result[1].split(", ")))
-        keywordRel = []
-        for i in range(self.keyword_cnt):
-            keywordRel.append(temp[self.keyword_cnt * i: self.keyword_cnt * (i + 1)])
-
-        # update figure axes
-        ax.set_title(f"{stock1.companyName} and {stock2.companyName}: {relScore:.1f}")
-
-        x, y, z = [], [], []
-        dx, dy, dz = [], [], []
-        for i in range(self.keyword_cnt):
-            for j in range(self.keyword_cnt):
-                x.append(i)
-                y.append(j)
-                z.append(0)
-                dx.append(1)
-                dy.append(1)
-                dz.append(keywordRel[i][j])
-
-        dz_np = np.array(dz)
-        dz_np = np.squeeze(dz_np)
-
-        nrm = mpl.colors.Normalize(-1, 1)
-        colors = plt.cm.RdBu(nrm(-dz_np))
-        alpha = np.linspace(0.2, 0.95, self.keyword_cnt, endpoint=True)
-
-        for i in range(len(x)):
-            ax.bar3d(
-                x[i], y[i], z[i], dx[i], dy[i], dz[i],
-                alpha=alpha[i % self.keyword_cnt], color=colors[i], linewidth=0)
-        resultCanvas.draw()
+        # update right figure plot, blitting cached render of previously shown pairs
+        keywordPlot.show(
+            (selectIdx[0], selectIdx[1], self.relationStore.version), keywordRel,
+            f"{stock1.companyName} and {stock2.companyName}: {relScore:.1f}", 'heatmap' if heatmap.get() else '3d')
 
         # update left diagram
 
@@ -583,21 +696,16 @@ class StockGUI:
         oval_outline = 'red'
 
         # relation data
-        query = f"{selectStocks[0].companyName}, {selectStocks[1].companyName}"
-        self.cur.execute(f"select Final_Value from Relations where Companies = \'{query}\';")
-        dataValue = float(self.cur.fetchone()[0])
-
-        # repeat for animation
-        animation_cnt = 40
+        dataValue = relScore
 
-        for cnt in range(animation_cnt + 1):
+        def drawFrame(progress: float) -> None:
             # clear bolded items
             for item in boldItems:
                 displayCanvas.delete(item)
             boldItems.clear()
 
             # redraw
-            total_perc = sqrt(1 - ((cnt - animation_cnt) ** 2 / (animation_cnt ** 2)))
+            total_perc = sqrt(1 - (progress - 1) ** 2)
 
             # draw bolded color line
             idx1 = selectIdx[0]
@@ -630,11 +738,13 @@ class StockGUI:
                     positions[idx][0] + oval_width // 2,
                     positions[idx][1] + oval_height // 2,
                     width=oval_hl_line_width * total_perc, outline=oval_outline, fill=oval_color))
-                boldItems.append(displayCanvas.create_text(
-                    positions[idx][0], positions[idx][1], text=self.allStockList[idx].companyName[:2]))
+                # labels only fit on larger nodes, like in the network itself
+                if show_labels:
+                    boldItems.append(displayCanvas.create_text(
+                        positions[idx][0], positions[idx][1], text=self.allStockList[idx].companyName[:2]))
 
-            toplevel.update()
-            sleep(0.01)
+        # animate on the event loop, replacing this Toplevel's running animation
+        self.animator.play(toplevel, drawFrame)
 
     def __destroyToplevel(self, event, window: Toplevel) -> None:
         """
@@ -645,8 +755,31 @@ class StockGUI:
         :param window: Tkinter Toplevel object
         :return: None
         """
+        self.animator.cancel(window)
         window.destroy()
 
+    def __closeGUI(self) -> None:
+        """
+        Helper method for self.runGUI() method.
+        Stops all running animations before destroying the GUI, so no frame is drawn on destroyed widgets.
+
+        :return: None
+        """
+        self.animator.cancelAll()
+        root.destroy()
+
+    def __canvasLayer(self, canvas: Canvas) -> CanvasLayer:
+        """
+        Helper method for self.__updateSubFrame2() and self.__updateSubFrame3() methods.
+        Finds retained-mode layer of given canvas, creating it on first use.
+
+        :param canvas: Canvas Tkinter widget
+        :return: CanvasLayer of canvas
+        """
+        if canvas not in self.canvasLayers:
+            self.canvasLayers[canvas] = CanvasLayer(canvas)
+        return self.canvasLayers[canvas]
+
     def __displaySpecificResults(self, main_idx: int, subFrame2Args: list,
                                  subFrame3Args: list) -> None:  # idx: base 1
         """
@@ -659,6 +792,8 @@ class StockGUI:
         :return: None
         """
         # updates subFrame2 and subFrame3
+        if main_idx != 0:
+            self.focus = (main_idx, subFrame2Args, subFrame3Args)
 
         # subFrame 3
         self.__updateSubFrame3(main_idx, subFrame3Args)
@@ -750,7 +885,8 @@ class StockGUI:
             max_graph_height - highlight_position + highlight_height / 2,
             fill='white', width=0)
 
-    def __updateSubFrame2(self, subFrame2Canvas: Canvas, parameters: list, stock_inc: list, main_idx: int) -> None:
+    def __updateSubFrame2(self, subFrame2Canvas: Canvas, parameters: list, stock_inc: list, main_idx: int,
+                          animate: bool = True) -> None:
         """
         Helper method for self.__displaySpecificResults() method.
         Updates subFrame2 canvas based on given parameter values.
@@ -759,6 +895,7 @@ class StockGUI:
         :param parameters: parameters for subFrame2
         :param stock_inc: stock increase value in percentage
         :param main_idx: stock Radiobutton IntVar() value
+        :param animate: False to draw final positions only (ex. live updates)
         :return: None
         """
         if main_idx == 0:
@@ -770,36 +907,18 @@ class StockGUI:
          highlight_position, highlight_height, y_axis_offset, graph_top_start, graph_bottom_padding,
          highlight_width] = parameters
 
-        # reset canvas
-        subFrame2Canvas.delete('all')
-        self.__subFrame2CanvasInit(subFrame2Canvas, parameters)
+        # reset highlight, keeping background & stock boxes for reuse
+        self.animator.cancel(subFrame2Canvas)
+        subFrame2Canvas.delete("highlight")
+        layer = self.__canvasLayer(subFrame2Canvas)
 
         # data
-        stockRelData = []
-
-        query = f"{self.allStockList[0].companyName}, {self.allStockList[1].companyName}"
-        self.cur.execute(f"select Final_Value from Relations where Companies = \'{query}\';")
+        stockRelData = self.relationStore.row(main_idx - 1).tolist()
 
-        for i in range(len(self.allStockList)):
-            for j in range(len(self.allStockList)):
-                if i != j:
-                    com1 = self.allStockList[i].companyName
-                    com2 = self.allStockList[j].companyName
-                    query = f"{com1}, {com2}"
-                    self.cur.execute(f"select Final_Value from Relations where Companies = \'{query}\';")
-                    result = float(self.cur.fetchone()[0])
-
-                    if i == main_idx - 1:
-                        stockRelData.append(result)
-
-        maxInc = minInc = self.allStockList[0].stockChangeDataShort[0] / self.allStockList[0].stockDataShort[
-            0] * 100
-        for i in range(len(self.allStockList)):
-            percs = [
-                self.allStockList[i].stockChangeDataShort[j] / self.allStockList[i].stockDataShort[j] * 100
-                for j in range(len(self.allStockList[i].stockChangeDataShort))]
-            maxInc = max(maxInc, max(percs))
-            minInc = min(minInc, min(percs))
+        # change percentages relative to previous price, per stock
+        changePercs = [stock.stockChangeDataShort / stock.stockDataShort[:-1] * 100 for stock in self.allStockList]
+        maxInc = max(percs.max() for percs in changePercs)
+        minInc = min(percs.min() for percs in changePercs)
 
         # parameters
         box_line_width = 4
@@ -811,7 +930,6 @@ class StockGUI:
         # items
         positions = []  # [[left x_perc, right x_perc, cur x_perc], y_cnt, color_idx], ...
         final_positions = []  # [[left x_coor, right x_coor, cur x_coor], y_coor, color_hex], ...
-        stockBoxes = []
 
         # get positions
         canvas_height = subFrame2Canvas.winfo_height()
@@ -824,23 +942,17 @@ class StockGUI:
         min_graph_width = (legend_xpad * 2 + legend_width + legend_labelpad) + box_xpad
         max_graph_width = canvas_width - axis_end_padding - box_xpad
 
-        # label main stock
-        subFrame2Canvas.create_text(
-            (min_graph_width + max_graph_width) / 2, title_yoffset,
-            text=f"{self.allStockList[main_idx - 1].companyName}", font=canvas_title_font)
-
-        # repeat for animation
-        animation_cnt = 40
-
-        for cnt in range(animation_cnt + 1):
-            for item in stockBoxes:
-                for item2 in item:
-                    subFrame2Canvas.delete(item2)
+        def drawFrame(progress: float) -> None:
+            layer.begin()
             positions.clear()
             final_positions.clear()
-            stockBoxes.clear()
 
-            total_perc = sqrt(1 - ((cnt - animation_cnt) ** 2 / (animation_cnt ** 2)))
+            # label main stock
+            layer.draw(
+                "title", 'text', [(min_graph_width + max_graph_width) / 2, title_yoffset],
+                text=f"{self.allStockList[main_idx - 1].companyName}", font=canvas_title_font)
+
+            total_perc = sqrt(1 - (progress - 1) ** 2)
 
             # calculate position (perc)
             for i in range(len(self.allStockList)):
@@ -848,11 +960,8 @@ class StockGUI:
                     idx = i - (i > main_idx - 1)
                     color_idx = int((stockRelData[idx] - minRelScore) / (maxRelScore - minRelScore) * subdiv_num)
 
-                    change_data = [
-                        self.allStockList[i].stockChangeDataShort[j] / self.allStockList[i].stockDataShort[j] * 100
-                        for j in range(len(self.allStockList[i].stockChangeDataShort))]
-                    left_xperc = min(change_data) / max(abs(maxInc), abs(minInc))
-                    right_xperc = max(change_data) / max(abs(maxInc), abs(minInc))
+                    left_xperc = changePercs[i].min() / max(abs(maxInc), abs(minInc))
+                    right_xperc = changePercs[i].max() / max(abs(maxInc), abs(minInc))
                     cur_xperc = stock_inc[i] / max(abs(maxInc), abs(minInc))
 
                     # multiply animation perc
@@ -879,35 +988,40 @@ class StockGUI:
                 color_hex = color[pos[2]]
                 final_positions.append([[left_xpos, right_xpos, cur_xpos], y_pos, color_hex])
 
-            # draw boxes
+            # draw boxes, moving & recoloring items of earlier frames
             for i in range(len(final_positions)):  # [[left x_coor, right x_coor, cur x_coor], y_coor, color_hex]
                 pos = final_positions[i]
                 stock_idx = i + (i >= main_idx - 1)
                 tag = f"box{stock_idx}"
 
-                center_oval = subFrame2Canvas.create_oval(
-                    pos[0][2] - box_length / 2, pos[1] - box_width / 2,
-                    pos[0][2] + box_length / 2, pos[1] + box_width / 2,
+                layer.draw(
+                    ("center_oval", stock_idx), 'oval', [
+                        pos[0][2] - box_length / 2, pos[1] - box_width / 2,
+                        pos[0][2] + box_length / 2, pos[1] + box_width / 2],
                     width=0, fill=pos[2], tags=tag
                 )
-                center_line = subFrame2Canvas.create_line(
-                    pos[0][0], pos[1],
-                    pos[0][1], pos[1],
+                layer.draw(
+                    ("center_line", stock_idx), 'line', [
+                        pos[0][0], pos[1],
+                        pos[0][1], pos[1]],
                     width=box_line_width, fill=pos[2], tags=tag
                 )
-                left_line = subFrame2Canvas.create_line(
-                    pos[0][0], pos[1] - box_width / 2,
-                    pos[0][0], pos[1] + box_width / 2,
+                layer.draw(
+                    ("left_line", stock_idx), 'line', [
+                        pos[0][0], pos[1] - box_width / 2,
+                        pos[0][0], pos[1] + box_width / 2],
                     width=box_line_width, fill=pos[2]
                 )
-                right_line = subFrame2Canvas.create_line(
-                    pos[0][1], pos[1] - box_width / 2,
-                    pos[0][1], pos[1] + box_width / 2,
+                layer.draw(
+                    ("right_line", stock_idx), 'line', [
+                        pos[0][1], pos[1] - box_width / 2,
+                        pos[0][1], pos[1] + box_width / 2],
                     width=box_line_width, fill=pos[2]
                 )
-                stockBoxes.append([center_oval, center_line, left_line, right_line])
-            root.update()
-            sleep(0.01)
+            layer.end()
+
+        # animate on the event loop (first frame is drawn right away), replacing this canvas' running animation
+        self.animator.play(subFrame2Canvas, drawFrame, 0.4 if animate else 0)
 
         # bind tk.ACTIVE with function to update display function
         for i in range(len(final_positions)):  # [[left x_coor, right x_coor, cur x_coor], y_coor, color_hex]
@@ -980,175 +1094,15 @@ class StockGUI:
         # other parameters
         company_cnt = 6
 
-        # reset both canvases
-        subFrame3Canvas1.delete('all')
-        subFrame3Canvas2.delete('all')
-
         # find stock
         curStock = self.allStockList[main_idx - 1]
 
         # update price
         priceLabel.config(text=f"Current Price: {curStock.stockDataShort[-1]:.2f} USD")
 
-        # canvas parameters
-        canvas_width = subFrame3Canvas1.winfo_width()
-        canvas_height = subFrame3Canvas1.winfo_height()
-
-        point_pad = 20
-        axis_pad = 40
-        axis_width = 1
-        y_pad = 5
-        axis_fill = 'black'
-
-        grid_width = 1
-        grid_fill = '#BFBFBF'
-
-        tick_length = 5
-        tick_width = 1
-        tick_fill = 'black'
-        text_size = 10
-
-        line_width = 3
-        line_fill = '#33D4FF'
-        oval_size = 5
-
-        intervals = [100, 50, 20, 10, 5, 2, 1, 0.5, 0.2, 0.1]
-        grid_cnt = 5
-
-        # canvas 1 data
-        short_minval = min(curStock.stockDataShort)
-        short_maxval = max(curStock.stockDataShort)
-
-        short_interval_values = list()
-        short_interval_raw = list()
-        short_interval = 0
-        short_points_raw = list()
-
-        for inter in intervals:
-            if (short_maxval - short_minval) / inter >= grid_cnt:
-                short_interval = inter
-                break
-
-        if short_interval == 0:
-            short_interval = intervals[-1]
-
-        int_min = ceil(short_minval / short_interval) * short_interval
-        int_max = floor(short_maxval / short_interval) * short_interval
-
-        int_it = int_min
-        while int_it <= int_max:
-            short_interval_values.append(int_it)
-            int_it += short_interval
-
-        for val in short_interval_values:
-            short_interval_raw.append(self.__findCanvasYPos(
-                subFrame3Canvas1, y_pad, short_minval, short_maxval, val))
-
-        for i in range(len(curStock.stockDataShort)):
-            short_points_raw.append(self.__findCanvasPos(
-                subFrame3Canvas1, point_pad + axis_pad, y_pad, len(curStock.stockDataShort), short_minval,
-                short_maxval,
-                i, curStock.stockDataShort[i]))
-
-        # draw canvas 1
-        subFrame3Canvas1.create_line(
-            canvas_width - axis_pad, 0,
-            canvas_width - axis_pad, canvas_height,
-            fill=axis_fill, width=axis_width)
-
-        for i in range(len(short_interval_values)):
-            val = short_interval_values[i]
-            raw_val = short_interval_raw[i]
-
-            subFrame3Canvas1.create_line(
-                0, raw_val,
-                canvas_width - axis_pad, raw_val,
-                fill=grid_fill, width=grid_width)
-            subFrame3Canvas1.create_line(
-                canvas_width - axis_pad, raw_val,
-                canvas_width - axis_pad + tick_length, raw_val,
-                fill=tick_fill, width=tick_width)
-            subFrame3Canvas1.create_text(
-                canvas_width - axis_pad + point_pad, raw_val,
-                text=f"{val:.0f}")
-
-        for i in range(len(short_points_raw) - 1):
-            subFrame3Canvas1.create_line(
-                short_points_raw[i][0], short_points_raw[i][1],
-                short_points_raw[i + 1][0], short_points_raw[i + 1][1],
-                fill=line_fill, width=line_width)
-        subFrame3Canvas1.create_oval(
-            short_points_raw[-1][0] - oval_size, short_points_raw[-1][1] - oval_size,
-            short_points_raw[-1][0] + oval_size, short_points_raw[-1][1] + oval_size,
-            fill=line_fill, width=0)
-
-        # canvas 1 data
-
-        long_minval = min(curStock.stockDataLong)
-        long_maxval = max(curStock.stockDataLong)
-
-        long_interval_values = list()
-        long_interval_raw = list()
-        long_interval = 0
-        long_points_raw = list()
-
-        for inter in intervals:
-            if (long_maxval - long_minval) / inter >= grid_cnt:
-                long_interval = inter
-                break
-
-        if long_interval == 0:
-            long_interval = intervals[-1]
-
-        int_min = ceil(long_minval / long_interval) * long_interval
-        int_max = floor(long_maxval / long_interval) * long_interval
-
-        int_it = int_min
-        while int_it <= int_max:
-            long_interval_values.append(int_it)
-            int_it += long_interval
-
-        for val in long_interval_values:
-            long_interval_raw.append(self.__findCanvasYPos(
-                subFrame3Canvas2, y_pad, long_minval, long_maxval, val))
-
-        for i in range(len(curStock.stockDataLong)):
-            long_points_raw.append(self.__findCanvasPos(
-                subFrame3Canvas2, point_pad + axis_pad, y_pad, len(curStock.stockDataLong), long_minval,
-                long_maxval,
-                i, curStock.stockDataLong[i]))
-
-        # draw canvas 2
-        subFrame3Canvas2.create_line(
-            canvas_width - axis_pad, 0,
-            canvas_width - axis_pad, canvas_height,
-            fill=axis_fill, width=axis_width)
-
-        for i in range(len(long_interval_values)):
-            val = long_interval_values[i]
-            raw_val = long_interval_raw[i]
-
-            subFrame3Canvas2.create_line(
-                0, raw_val,
-                canvas_width - axis_pad, raw_val,
-                fill=grid_fill, width=grid_width)
-            subFrame3Canvas2.create_line(
-                canvas_width - axis_pad, raw_val,
-                canvas_width - axis_pad + tick_length, raw_val,
-                fill=tick_fill, width=tick_width)
-            subFrame3Canvas2.create_text(
-                canvas_width - axis_pad + point_pad, raw_val,
-                text=f"{val:.0f}")
-
-        for i in range(len(long_points_raw) - 1):
-            subFrame3Canvas2.create_line(
-                long_points_raw[i][0], long_points_raw[i][1],
-                long_points_raw[i + 1][0], long_points_raw[i + 1][1],
-                fill=line_fill, width=line_width)
-        subFrame3Canvas2.create_oval(
-            long_points_raw[-1][0] - oval_size, long_points_raw[-1][1] - oval_size,
-            long_points_raw[-1][0] + oval_size, long_points_raw[-1][1] + oval_size,
-            fill=line_fill, width=0)
+        # update both canvases, reusing items drawn for previous stock
+        self.__drawPriceChart(subFrame3Canvas1, curStock.stockDataShort)
+        self.__drawPriceChart(subFrame3Canvas2, curStock.stockDataLong)
 
         predictionResults = self.__calculatePrediction(
             curStock)  # [(short-term, percent, [stocks]), (long-term, percent, [stocks])]
@@ -1201,7 +1155,7 @@ class StockGUI:
             trendLongColor = 'red'
             trendLongText = f'{curStock.stockChangeDataLong[-1]: .2f} USD ({trendLongPercent: .2f}%)'
 
-        if curStock.changeImportance[1]:
+        if curStock.changeImportance[-1]:
             changeImpLongColor = 'green'
         else:
             changeImpLongColor = 'red'
@@ -1227,15 +1181,116 @@ class StockGUI:
             longRelText = longRelText[:-2]
 
         trendLong.config(text=f"{trendLongText}", fg=trendLongColor)
-        changeImpLong.config(text=f"{curStock.changeImportance[1]}", fg=changeImpLongColor)
+        changeImpLong.config(text=f"{curStock.changeImportance[-1]}", fg=changeImpLongColor)
         predictLong.config(text=predictLongText, fg=predictLongColor)
         relatedLong.config(text=longRelText)
 
+    def __drawPriceChart(self, canvas: Canvas, prices: np.ndarray) -> None:
+        """
+        Helper method for self.__updateSubFrame3() method.
+        Draws price graph with grid & value axis on given canvas, updating items of the previous graph in place.
+
+        :param canvas: subFrame3 canvas Tkinter widget
+        :param prices: stock prices to draw
+        :return: None
+        """
+        layer = self.__canvasLayer(canvas)
+        layer.begin()
+
+        # canvas parameters
+        canvas_width = canvas.winfo_width()
+        canvas_height = canvas.winfo_height()
+
+        point_pad = 20
+        axis_pad = 40
+        axis_width = 1
+        y_pad = 5
+        axis_fill = 'black'
+
+        grid_width = 1
+        grid_fill = '#BFBFBF'
+
+        tick_length = 5
+        tick_width = 1
+        tick_fill = 'black'
+
+        line_width = 3
+        line_fill = '#33D4FF'
+        oval_size = 5
+
+        intervals = [100, 50, 20, 10, 5, 2, 1, 0.5, 0.2, 0.1]
+        grid_cnt = 5
+
+        # data
+        minval = prices.min()
+        maxval = prices.max()
+
+        interval_values = list()
+        interval = 0
+
+        for inter in intervals:
+            if (maxval - minval) / inter >= grid_cnt:
+                interval = inter
+                break
+
+        if interval == 0:
+            interval = intervals[-1]
+
+        int_min = ceil(minval / interval) * interval
+        int_max = floor(maxval / interval) * interval
+
+        int_it = int_min
+        while int_it <= int_max:
+            interval_values.append(int_it)
+            int_it += interval
+
+        points_raw = [self.__findCanvasPos(
+            canvas, point_pad + axis_pad, y_pad, len(prices), minval, maxval, i, prices[i]) for i in range(len(prices))]
+
+        # draw
+        layer.draw(
+            "axis", 'line', [
+                canvas_width - axis_pad, 0,
+                canvas_width - axis_pad, canvas_height],
+            fill=axis_fill, width=axis_width)
+
+        for i in range(len(interval_values)):
+            val = interval_values[i]
+            raw_val = self.__findCanvasYPos(canvas, y_pad, minval, maxval, val)
+
+            layer.draw(
+                ("grid", i), 'line', [
+                    0, raw_val,
+                    canvas_width - axis_pad, raw_val],
+                fill=grid_fill, width=grid_width)
+            layer.draw(
+                ("tick", i), 'line', [
+                    canvas_width - axis_pad, raw_val,
+                    canvas_width - axis_pad + tick_length, raw_val],
+                fill=tick_fill, width=tick_width)
+            layer.draw(
+                ("label", i), 'text', [canvas_width - axis_pad + point_pad, raw_val],
+                text=f"{val:.0f}")
+
+        # price line as a single item, kept above grid lines created later
+        price_line = layer.draw(
+            "price", 'line', [value for point in points_raw for value in point],
+            fill=line_fill, width=line_width)
+        current_oval = layer.draw(
+            "current", 'oval', [
+                points_raw[-1][0] - oval_size, points_raw[-1][1] - oval_size,
+                points_raw[-1][0] + oval_size, points_raw[-1][1] + oval_size],
+            fill=line_fill, width=0)
+        canvas.tag_raise(price_line)
+        canvas.tag_raise(current_oval)
+
+        layer.end()
+
     def __findCanvasPos(
             self, canvas: Canvas, x_pad: int, y_pad: int, point_cnt: int, min_val: float, max_val: float,
             cnt: int, value: float) -> list:
         """
-        Helper method for self.__updateSubFrame3() method.
+        Helper method for self.__drawPriceChart() method.
         Finds correct canvas coordinate position based on given values (x_cnt & stock value).
 
         :param canvas: given Canvas Tkinter widget
@@ -1256,7 +1311,7 @@ class StockGUI:
 
     def __findCanvasYPos(self, canvas: Canvas, y_pad: int, min_val: float, max_val: float, value: float) -> float:
         """
-        Helper method for self.__updateSubFrame3() method.
+        Helper method for self.__drawPriceChart() method.
         Finds correct y-coordinate canvas position based on given values (stock value).
 
         :param canvas: given Canvas Tkinter widget
@@ -1271,58 +1326,17 @@ class StockGUI:
     def __calculatePrediction(self, curStock: Stock) -> list:
         """
         Helper method for self.__updateSubFrame3() method.
-        Calculates predictions for given stock based on current stock data & company relations.
+        Reads predictions for given stock from predictions calculated for all stocks (see PredictionEngine.py).
 
         :param curStock: currently selected Stock object
         :return:
             [(short prediction USD, short prediction %, short related stocks list),
             (long prediction USD, long prediction %, long related stocks list)]
         """
-        curPrice = curStock.stockDataShort[-1]
-
-        # short term
-        shortRelStocks = dict()
-        shortChange = curStock.stockChangeDataShort[-1]
-        shortInfluence = 0
-        shortRelDisplay = list()
-
-        for stock in self.allStockList:
-            if stock != curStock and stock.changeImportance[0]:
-                query = f"{curStock.companyName}, {stock.companyName}"
-                self.cur.execute(f"select Final_Value from Relations where Companies = \'{query}\';")
-                shortRelStocks[stock] = (float(self.cur.fetchone()[0]) - minRelScore) / (maxRelScore - minRelScore)
-
-        for stock in shortRelStocks.keys():
-            shortInfluence += stock.stockChangeDataShort[-1] * shortRelStocks[stock]
-
-        shortRelStocks = dict(sorted(shortRelStocks.items(), key=lambda x: x[1], reverse=True))
-
-        for key in shortRelStocks:
-            if shortRelStocks[key] >= 0.5:
-                shortRelDisplay.append(key)
-
-        # long term
-        longRelStocks = dict()
-        longChange = curStock.stockChangeDataLong[-1]
-        longInfluence = 0
-        longRelDisplay = list()
-
-        for stock in self.allStockList:
-            if stock != curStock and stock.changeImportance[1]:
-                query = f"{curStock.companyName}, {stock.companyName}"
-                self.cur.execute(f"select Final_Value from Relations where Companies = \'{query}\';")
-                longRelStocks[stock] = (float(self.cur.fetchone()[0]) - minRelScore) / (maxRelScore - minRelScore)
-
-        for stock in longRelStocks.keys():
-            longInfluence += stock.stockChangeDataLong[-1] * longRelStocks[stock]
-
-        longRelStocks = dict(sorted(longRelStocks.items(), key=lambda x: x[1], reverse=True))
-
-        for key in longRelStocks:
-            if longRelStocks[key] >= 0.5:
-                longRelDisplay.append(key)
+        idx = self.allStockList.index(curStock)
 
-        return [
-            (shortChange + shortInfluence, (shortChange + shortInfluence) / curPrice * 100, shortRelDisplay),
-            (longChange + longInfluence, (longChange + longInfluence) / curPrice * 100, longRelDisplay)
-        ]
+        results = []
+        for (prediction, percent, related) in (self.predictions[0], self.predictions[-1]):
+            results.append(
+                (float(prediction[idx]), float(percent[idx]), [self.allStockList[j] for j in related[idx]]))
+        return results
@@ -1,10 +1,21 @@
 from Stock import Stock
 from StockData import StockData
-from StockGUI import StockGUI
-
+from TfIdf import TfIdf
+from KeywordRelation import KeywordRelation
+from ParallelRelation import ParallelRelation
+from VectorStore import VectorStore
+from TermStore import TermStore
+from PriceProvider import YahooProvider
+from PriceCache import PriceCache
+from PriceFeed import PriceFeed
+from RelationStore import RelationStore
+from PredictionEngine import PredictionEngine
+from Backtest import Backtest
+from Report import Report
+
+import os
 import sqlite3
-import spacy
-from math import log
+import numpy as np
 
 
 class System:
@@ -12,20 +23,39 @@ class System:
     Overarching System class for organization & main analysis functions.
     """
 
-    def __init__(self):
+    def __init__(self, vectorPath: str = "WordVectors", priceProvider=None, offline: bool = False,
+                 timePeriod: list = None):
         """
         Class constructor.
-        Establishes connection with SQL Database, loads NLP vector space model, initializes instance variables.
+        Establishes connection with SQL Database (migrating legacy article data, see TermStore.py),
+        initializes instance variables.
+        The word vector store (see VectorStore.py) is only opened once relation analysis runs.
+
+        :param vectorPath: path prefix of exported word vector store
+        :param priceProvider: price provider for stock data (see PriceProvider.py),
+                              defaults to Yahoo Finance through the local price cache (see PriceCache.py)
+        :param offline: True to serve stock data from the local price cache only, without downloading
+        :param timePeriod: time periods (horizons) [(interval, period), ...] from shortest to longest,
+                           all resampled from a single download (see StockData.py)
         """
         self.allStockList = []
         self.articleData = None
 
         self.conn = sqlite3.connect("StockDatabase.db")
         self.cur = self.conn.cursor()
+        TermStore(self.conn)
 
-        self.nlp = spacy.load('en_core_web_lg')
+        self.vectorPath = vectorPath
+        self.vectors = None
         self.keyword_cnt = 10
-        self.timePeriod = (('1h', '1mo'), ('1d', '6mo'))
+        self.timePeriod = timePeriod if timePeriod is not None else [('1h', '1mo'), ('1d', '6mo')]
+        if priceProvider is None:
+            priceProvider = PriceCache(None if offline else YahooProvider(), offline=offline)
+        self.priceProvider = priceProvider
+        self.failedStocks = dict()  # {stock name: failure reason}
+        self.changeHalfLife = None  # None weights all past changes equally
+        self.changeStats = []  # [RunningStats, ...] per time period, one stream per stock in self.allStockList
+        self.priceFeed = None  # live price feed while GUI runs in live mode
 
     def addStock(self, stockName: str, companyName: str) -> None:
         """
@@ -37,143 +67,85 @@ class System:
         """
         self.allStockList.append(Stock(stockName, companyName))
 
-    def runAllRelAnalysis(self) -> None:
+    def runAllRelAnalysis(self, processes: int = 1) -> None:
         """
         Uses article data in StockDatabase to calculate TF-IDF to determine keywords for each company.
         Uses vector space model to quantify similarity between companies using the keywords.
         Saves keywords, keyword similarities, and company similarities into StockDatabase.
 
+        :param processes: number of worker processes for company pair calculation (1 runs in this process)
         :return: None
         """
         # erases current database
 
         # runs new analysis
-        stockLen = len(self.allStockList)
-        for i in range(stockLen):
-            self.__stockTermCalculate(self.allStockList[i])
-
-        for i in range(0, stockLen - 1):
-            for j in range(i + 1, stockLen):
-                stock1 = self.allStockList[i]
-                stock2 = self.allStockList[j]
-                self.__stockRelCalculate(stock1, stock2)
-    def __stockTermCalculate(self, stock: Stock) -> bool:
-        """
-        Sub method for self.runAllRelAnalysis method.
+        if self.vectors is None:
+            self.vectors = VectorStore(self.vectorPath)
+        TfIdf(self.cur).calculate(self.allStockList)
 
-        Calculates TF-IDF for all words in articles relating to certain company (stock).
-        Temporarily saves TF-IDF values into Stock object.
-
-        :param stock: Stock object for company in question
-        :return: True if successfully calculated TF-IDF, False if already calculated
-        """
-        if stock.calculated:
-            return False
-        self.cur.execute(f"select Word_Frequency from Articles where Stocks like \"%{stock.companyName}%\";")
-        stock1_tf_list = self.cur.fetchall()
-        for word_list in stock1_tf_list:
-            if word_list == "":
-                continue
-            for word_freq in word_list[0][1: -1].split("), ("):
-                [word, freq] = word_freq.split(", ")
-                if word in stock.tf_idf:
-                    stock.tf_idf[word] += int(freq)
-                else:
-                    stock.tf_idf[word] = int(freq)
-
-        self.cur.execute(f"select count(*) from Articles;")
-        doc_num = int(self.cur.fetchone()[0])
-        for word in stock.tf_idf:
-            self.cur.execute(
-                f"select count(*) from Articles where Stocks like \"%{stock.companyName}%\" "
-                f"and Word_Frequency like \"%{word}%\";")
-            word_idf = int(self.cur.fetchone()[0])
-            word_idf = log(doc_num / (1 + word_idf), 10)
-            stock.tf_idf[word] *= word_idf
-
-        stock.tf_idf = dict(sorted(stock.tf_idf.items(), key=lambda x: x[1], reverse=True))
-        stock.calculated = True
-        return True
+        for stock in self.allStockList:
+            self.cur.execute(f"select count(*) from Companies where Name = \'{stock.companyName}\'")
+            if self.cur.fetchone()[0] == 0:
+                self.__stockChooseKeywords(stock)
+
+        keywordRelation = KeywordRelation(self.vectors.getVector, self.keyword_cnt)
+        keywordMatrix = keywordRelation.keywordMatrix(self.allStockList)
+
+        if processes > 1:
+            first, second, relBlocks, relScores = ParallelRelation(processes).calculate(keywordMatrix)
+        else:
+            first, second = ParallelRelation.pairIndices(len(self.allStockList))
+            allBlocks = keywordRelation.allSimilarityBlocks(keywordMatrix)
+            relBlocks = allBlocks[first, :, second, :]
+            relScores = keywordRelation.relationScores(allBlocks)[first, second]
+
+        rows = []
+        for k in range(len(first)):
+            stock1 = self.allStockList[first[k]]
+            stock2 = self.allStockList[second[k]]
+            rows += self.__stockRelCalculate(stock1, stock2, relBlocks[k], relScores[k])
+
+        self.cur.executemany("insert into Relations values (?, ?, ?)", rows)
+        self.conn.commit()
 
-    def __stockRelCalculate(self, stock1: Stock, stock2: Stock) -> bool:
+    def __stockRelCalculate(self, stock1: Stock, stock2: Stock, relations: np.ndarray, relScore: float) -> list:
         """
         Sub method for self.runAllRelAnalysis method.
 
-        Chooses keywords for given stocks.
-        Regarding the two given stocks, calculates similarity for all keyword combinations using vector space model.
-        Calculates overall similarity for given stocks, assuming basis of 0.25 similarity for significance.
+        Regarding the two given stocks, saves similarity for all keyword combinations calculated using vector space
+        model, along with overall similarity for given stocks (assuming basis of 0.25 similarity for significance).
         Company similarity will henceforth be referred to as "relation value".
-        Saves all keyword relations and final relation values into StockDatabase.
+        Formats all keyword relations and final relation values for StockDatabase.
 
         :param stock1: Stock object for first company
         :param stock2: Stock object for second company
-        :return: True if successfully calculated relation value, False if already calculated
+        :param relations: (keyword x keyword) similarity block between stock1 and stock2 keywords
+        :param relScore: relation value between stock1 and stock2
+        :return: Relations table rows for both directions of the pair, empty if already calculated
         """
         if stock2 in stock1.RelSentimentScore:
-            return False
-
-        self.cur.execute(f"select count(*) from Companies where Name = \'{stock1.companyName}\'")
-        if self.cur.fetchone()[0] == 0:
-            self.__stockChooseKeywords(stock1)
-
-        self.cur.execute(f"select count(*) from Companies where Name = \'{stock2.companyName}\'")
-        if self.cur.fetchone()[0] == 0:
-            self.__stockChooseKeywords(stock2)
+            return []
 
-        stock1.keywordRel[stock2] = [[0 for _ in range(len(stock2.keywords))] for _ in range(len(stock1.keywords))]
-        stock2.keywordRel[stock1] = [[0 for _ in range(len(stock1.keywords))] for _ in range(len(stock2.keywords))]
+        relations1 = relations.tolist()
+        relations2 = relations.T.tolist()
+        relScore = float(relScore)
 
-        com1 = stock1.companyName + ", " + stock2.companyName
-        com2 = stock2.companyName + ", " + stock1.companyName
-        self.cur.execute(f"insert into Relations values (\'{com1}\', null, null)")
-        self.cur.execute(f"insert into Relations values (\'{com2}\', null, null)")
-        self.conn.commit()
-
-        relations1 = [[0.0 for _ in range(self.keyword_cnt)] for _ in range(self.keyword_cnt)]
-        relations2 = [[0.0 for _ in range(self.keyword_cnt)] for _ in range(self.keyword_cnt)]
-
-        relScore = 0
-        for i in range(len(stock1.keywords)):
-            for j in range(len(stock2.keywords)):
-                word1 = stock1.keywords[i]
-                word2 = stock2.keywords[j]
-
-                tokens = self.nlp(f"{word1} {word2}")
-                curScore = tokens[0].similarity(tokens[1])
-
-                stock1.keywordRel[stock2][i][j] = curScore
-                stock2.keywordRel[stock1][j][i] = curScore
-
-                relations1[i][j] = curScore
-                relations2[j][i] = curScore
-
-                curScore = (curScore * 10 / 2.5) ** 2
-                relScore += curScore
+        stock1.keywordRel[stock2] = [row[:len(stock2.keywords)] for row in relations1[:len(stock1.keywords)]]
+        stock2.keywordRel[stock1] = [row[:len(stock1.keywords)] for row in relations2[:len(stock2.keywords)]]
 
         stock1.RelSentimentScore[stock2] = relScore
         stock2.RelSentimentScore[stock1] = relScore
 
-        insert1 = ""
-        insert2 = ""
-
-        for i in range(self.keyword_cnt):
-            for j in range(self.keyword_cnt):
-                insert1 += str(relations1[i][j]) + ", "
-                insert2 += str(relations2[i][j]) + ", "
-
-        self.cur.execute(
-            f"update Relations set Relations = \'{insert1[:-2]}\' , "
-            f"Final_value = \'{relScore}\' where Companies = \'{com1}\'")
-        self.cur.execute(
-            f"update Relations set Relations = \'{insert2[:-2]}\' , "
-            f"Final_value = \'{relScore}\' where Companies = \'{com2}\'")
-        self.conn.commit()
+        com1 = stock1.companyName + ", " + stock2.companyName
+        com2 = stock2.companyName + ", " + stock1.companyName
+        insert1 = ", ".join(str(value) for row in relations1 for value in row)
+        insert2 = ", ".join(str(value) for row in relations2 for value in row)
 
-        return True
+        return [(com1, insert1, str(relScore)), (com2, insert2, str(relScore))]
 
     def __stockChooseKeywords(self, stock: Stock) -> bool:
         """
-        Sub method for self.__stockRelCalculate method.
+        Sub method for self.runAllRelAnalysis method.
         Chooses certain number (self.keyword_cnt) of keywords for each stock, based on highest TF-IDF value.
         Saves keywords into StockDatabase.
 
@@ -184,36 +156,135 @@ class System:
             return False
 
         self.cur.execute(f"insert into Companies values (\'{stock.companyName}\', null)")
-        idx = 0
         insert_str = ""
-        while len(stock.keywords) < self.keyword_cnt and idx < len(stock.tf_idf):
-            keyword = list(stock.tf_idf.keys())[idx]
-            if self.nlp(keyword)[0].has_vector:
+        for keyword in stock.tf_idf:
+            if len(stock.keywords) >= self.keyword_cnt:
+                break
+            if self.vectors.hasVector(keyword):
                 stock.keywords.append(keyword)
                 insert_str += f"{keyword}, "
-            idx += 1
         self.cur.execute(f"update Companies set Keywords = \'{insert_str[:-2]}\' where Name = \'{stock.companyName}\';")
         self.conn.commit()
         return True
 
-    def runAllPredictAnalysis(self) -> bool:
+    def runAllPredictAnalysis(self) -> dict:
         """
         Runs stock data analysis to determine predicted stock movement.
+        Stocks whose data could not be collected or analyzed are reported & removed from self.allStockList,
+        instead of stopping the whole analysis.
 
-        :return: None
+        :return: {stock name: failure reason} for removed stocks
         """
         # collect past stock data
+        failures = StockData.retrieveAllData(self.allStockList, self.timePeriod, self.priceProvider)
+
         for stock in self.allStockList:
-            if not StockData.retrieveData(stock, self.timePeriod[0], self.timePeriod[1]):
-                return False
+            if stock.stockName not in failures and not StockData.hasEnoughData(stock):
+                failures[stock.stockName] = "not enough price data to analyze"
+
+        for stockName in failures:
+            print(f"Skipping {stockName}: {failures[stockName]}")
+        self.allStockList = [stock for stock in self.allStockList if stock.stockName not in failures]
+        self.failedStocks.update(failures)
 
         # divide b/w important & nonimportant data change
-        for stock in self.allStockList:
-            if not StockData.analyzeStockData(stock):
-                return False
+        self.changeStats = StockData.analyzeAllStockData(self.allStockList, self.changeHalfLife)
 
-        return True
+        return failures
+
+    def runAllPredictions(self) -> list:
+        """
+        Predicts stock movement of all stocks in every time period at once, from current stock data & relations.
+
+        :return: [(predicted change USD, predicted change %, mainly related stock indices), ...] per time period
+                 (see PredictionEngine.py), in self.allStockList order
+        """
+        predictionEngine = PredictionEngine(RelationStore(self.cur, self.allStockList).values)
+        return predictionEngine.predictAll(self.allStockList)
+
+    def writeReports(self, directory: str = "output", fileFormat: str = "csv") -> list:
+        """
+        Writes predictions, change importance & relation values of all stocks into files (see Report.py).
+
+        :param directory: output directory
+        :param fileFormat: 'csv', 'json' or 'parquet'
+        :return: list of written file paths
+        """
+        relations = RelationStore(self.cur, self.allStockList).values
+        predictionEngine = PredictionEngine(relations)
+
+        paths = [os.path.join(directory, f"relations.{fileFormat}"),
+                 os.path.join(directory, f"predictions.{fileFormat}")]
+        # predictions are written last, marking a finished run (see PredictionService.py)
+        Report.write(Report.relationTable(self.allStockList, relations, predictionEngine.relations), paths[0])
+        Report.write(Report.predictionTable(
+            self.allStockList, self.timePeriod, predictionEngine.predictAll(self.allStockList)), paths[1])
+        return paths
+
+    def runBacktest(self, relationCutoffs: list = (0.0,), sigmas: list = (1.0,), processes: int = 1) -> list:
+        """
+        Backtests prediction over the stored price history of every time period (see Backtest.py),
+        for every combination of given parameters.
+
+        :param relationCutoffs: minimum normalized relation values of influencing stocks (0 includes all stocks)
+        :param sigmas: numbers of standard deviations a change must exceed to be significant
+        :param processes: number of worker processes (1 runs in this process)
+        :return: [[backtest report, ...] sorted by highest hit rate, ...] per time period
+        """
+        tickers = [stock.stockName for stock in self.allStockList]
+        base = StockData.baseHorizon(self.timePeriod)
+        frames, failures = self.priceProvider.history(tickers, base[0], base[1])
+        horizon_frames = {ticker: StockData.resampleData(frames[ticker], base[0], self.timePeriod)
+                          for ticker in frames}
+        relations = RelationStore(self.cur, self.allStockList).values
+
+        results = []
+        for h in range(len(self.timePeriod)):
+            prices = Backtest.priceMatrix({ticker: horizon_frames[ticker][h] for ticker in horizon_frames}, tickers)
+            backtest = Backtest(prices, relations, tickers, halfLife=self.changeHalfLife)
+            if processes > 1:
+                results.append(backtest.grid(relationCutoffs, sigmas, processes))
+            else:
+                reports = [backtest.run(cutoff, sigma) for cutoff in relationCutoffs for sigma in sigmas]
+                results.append(sorted(reports, key=lambda report: report['hitRate'], reverse=True))
+        return results
+
+    def pollPriceUpdates(self) -> set:
+        """
+        Merges price bars downloaded by the live price feed since the last call into stock data,
+        re-analyzing only the stocks whose stock data changed.
 
-    def runStockGUI(self) -> None:
-        stockGUI = StockGUI(self.allStockList, self.timePeriod)
-        stockGUI.runGUI()
+        :return: set of indices (in self.allStockList) of changed stocks
+        """
+        updates = None if self.priceFeed is None else self.priceFeed.latest()
+        if updates is None:
+            return set()
+        return StockData.updateAllData(self.allStockList, self.changeStats, updates)
+
+    def runStockGUI(self, pollInterval: float = None) -> None:
+        """
+        Runs stock GUI. In live mode, prices are polled on a background thread while the GUI is open,
+        and the GUI redraws the views of changed stocks.
+
+        :param pollInterval: seconds between live price polls, None to display current stock data only
+        :return: None
+        """
+        # imported here, so headless runs never load tkinter/matplotlib
+        from StockGUI import StockGUI
+
+        relationStore = RelationStore(self.cur, self.allStockList)
+        predictionEngine = PredictionEngine(relationStore.values)
+        if pollInterval is None:
+            stockGUI = StockGUI(self.allStockList, self.timePeriod, relationStore, predictionEngine)
+            stockGUI.runGUI()
+            return
+
+        self.priceFeed = PriceFeed(self.priceProvider, self.allStockList, self.timePeriod, pollInterval)
+        self.priceFeed.start()
+        try:
+            stockGUI = StockGUI(
+                self.allStockList, self.timePeriod, relationStore, predictionEngine, self.pollPriceUpdates)
+            stockGUI.runGUI()
+        finally:
+            self.priceFeed.stop()
+            self.priceFeed = None
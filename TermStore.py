@@ -0,0 +1,164 @@
+import sys
+import sqlite3
+
+
+class TermStore:
+    """
+    TermStore class that stores article word frequencies & related companies in normalized form.
+
+    Tables:
+    - Articles (Article_Num, Article_ID): Article_Num is an integer key, Article_ID stores the article link
+    - Terms (Term_ID, Term): vocabulary of all words with integer IDs
+    - Postings (Article_Num, Term_ID, Frequency): frequency of each term in each article
+    - ArticleCompanies (Article_Num, Company): companies related to each article
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Class constructor.
+        Creates normalized tables if needed & migrates legacy Word_Frequency/Stocks data into them.
+
+        :param conn: SQL Database connection
+        """
+        self.conn = conn
+        self.cur = conn.cursor()
+        self.termIds = dict()  # {word: Term_ID}
+
+        self.migrated = self.migrate()
+        self.cur.execute("select Term, Term_ID from Terms;")
+        self.termIds = dict(self.cur.fetchall())
+
+    def __createTables(self) -> None:
+        """
+        Helper method for self.migrate() method.
+        Creates normalized tables & their indexes if they do not exist.
+
+        :return: None
+        """
+        self.cur.execute(
+            "create table if not exists Articles ("
+            "Article_Num integer primary key, Article_ID text not null unique);")
+        self.cur.execute(
+            "create table if not exists Terms (Term_ID integer primary key, Term text not null unique);")
+        self.cur.execute(
+            "create table if not exists Postings ("
+            "Article_Num integer not null, Term_ID integer not null, Frequency integer not null, "
+            "primary key (Article_Num, Term_ID)) without rowid;")
+        # postings are only read in full (see TfIdf.py), so no Term_ID index is kept up to date on every insert
+        self.cur.execute("drop index if exists Postings_Term;")
+        self.cur.execute(
+            "create table if not exists ArticleCompanies ("
+            "Article_Num integer not null, Company text not null, primary key (Article_Num, Company)) without rowid;")
+        self.cur.execute("create index if not exists ArticleCompanies_Company on ArticleCompanies (Company);")
+
+    def migrate(self) -> bool:
+        """
+        Converts legacy Articles tables into normalized tables:
+        - (Article_ID, Word_Frequency, Stocks): parses every "(word1, frequency1), (word2, frequency2), ..." string
+          once into postings
+        - (Article_Num, Article_ID, Stocks): keeps article numbers & postings
+        Comma-joined Stocks strings are split into ArticleCompanies rows, then the string columns are dropped.
+
+        :return: True if legacy data was migrated, False if database was already normalized
+        """
+        self.cur.execute("select name from pragma_table_info('Articles');")
+        columns = [row[0] for row in self.cur.fetchall()]
+        if "Word_Frequency" not in columns and "Stocks" not in columns:
+            self.__createTables()
+            self.conn.commit()
+            return False
+
+        self.cur.execute("begin;")
+        self.cur.execute("alter table Articles rename to Articles_Legacy;")
+        self.__createTables()
+
+        if "Word_Frequency" in columns:
+            self.cur.execute("select Article_ID, Word_Frequency, Stocks from Articles_Legacy;")
+            for (link, word_list, stocks) in self.cur.fetchall():
+                word_freq = dict()
+                if word_list:
+                    for entry in word_list[1: -1].split("), ("):
+                        [word, freq] = entry.rsplit(", ", 1)
+                        word_freq[word] = word_freq.get(word, 0) + int(freq)
+                article_num = self.articleNum(link)
+                if article_num is None:
+                    self.addArticle(link, word_freq, (stocks or "").split(", "))
+                else:
+                    # duplicate legacy rows: keep first word frequencies, merge companies
+                    self.addCompanies(article_num, (stocks or "").split(", "))
+        else:
+            self.cur.execute("insert into Articles select Article_Num, Article_ID from Articles_Legacy;")
+            self.cur.execute("select Article_Num, Stocks from Articles_Legacy;")
+            for (article_num, stocks) in self.cur.fetchall():
+                self.addCompanies(article_num, (stocks or "").split(", "))
+
+        self.cur.execute("drop table Articles_Legacy;")
+        self.conn.commit()
+        self.conn.execute("vacuum;")
+        return True
+
+    def articleNum(self, link: str) -> int | None:
+        """
+        Finds Article_Num of given article link.
+
+        :param link: Article link
+        :return: Article_Num, None if article is not stored
+        """
+        self.cur.execute("select Article_Num from Articles where Article_ID = ?;", (link,))
+        row = self.cur.fetchone()
+        return None if row is None else row[0]
+
+    def termId(self, word: str) -> int:
+        """
+        Finds integer ID of given word, adding it to the vocabulary if new.
+
+        :param word: given word
+        :return: Term_ID
+        """
+        term_id = self.termIds.get(word)
+        if term_id is None:
+            self.cur.execute("insert into Terms (Term) values (?);", (word,))
+            term_id = self.termIds[word] = self.cur.lastrowid
+        return term_id
+
+    def addArticle(self, link: str, word_freq: dict, companies) -> int:
+        """
+        Inserts article, its word frequencies & its related companies. Does not commit.
+
+        :param link: Article link
+        :param word_freq: {word: frequency} of article
+        :param companies: iterable of company names related to article
+        :return: Article_Num of inserted article
+        """
+        self.cur.execute("insert into Articles (Article_ID) values (?);", (link,))
+        article_num = self.cur.lastrowid
+        self.cur.executemany(
+            "insert into Postings values (?, ?, ?);",
+            [(article_num, self.termId(word), freq) for word, freq in word_freq.items()])
+        self.addCompanies(article_num, companies)
+        return article_num
+
+    def addCompanies(self, article_num: int, companies) -> None:
+        """
+        Relates given companies to article, ignoring existing relations. Does not commit.
+
+        :param article_num: Article_Num of article
+        :param companies: iterable of company names
+        :return: None
+        """
+        self.cur.executemany(
+            "insert or ignore into ArticleCompanies values (?, ?);",
+            [(article_num, company) for company in companies if company])
+
+
+if __name__ == "__main__":
+    # usage: python TermStore.py [database path]
+    database = sys.argv[1] if len(sys.argv) > 1 else "StockDatabase.db"
+
+    conn = sqlite3.connect(database)
+    termStore = TermStore(conn)
+    if termStore.migrated:
+        print(f"Migrated {database} to normalized Terms/Postings tables ({len(termStore.termIds)} terms)")
+    else:
+        print(f"{database} is already normalized")
+    conn.close()
@@ -0,0 +1,135 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from nltk import word_tokenize
+from nltk.stem import WordNetLemmatizer
+from nltk.tag.perceptron import PerceptronTagger
+
+# worker process state, set once per process by _initWorker
+_workerPreprocessor = None
+
+
+def _initWorker(stopwordPath: str, cacheSize: int) -> None:
+    """
+    Process pool initializer.
+    Creates the worker process' own TextPreprocessor.
+
+    :param stopwordPath: path of space-separated stopword file
+    :param cacheSize: maximum number of (word, pos) lemmas to memoize
+    :return: None
+    """
+    global _workerPreprocessor
+    _workerPreprocessor = TextPreprocessor(stopwordPath, cacheSize)
+
+
+def _frequencyText(text: str) -> dict:
+    """
+    Process pool task.
+    Lemmatizes given article text & counts its word frequencies.
+
+    :param text: Extracted full article text
+    :return: {word: frequency}
+    """
+    return TextPreprocessor.frequency(_workerPreprocessor.lemmatize(text))
+
+
+class TextPreprocessor:
+    """
+    TextPreprocessor class that removes stopwords from article texts & lemmatizes remaining words into base form.
+    Meant to be created once and reused for every article.
+    """
+
+    def __init__(self, stopwordPath: str = "stopwords.txt", cacheSize: int = 1 << 16):
+        """
+        Class constructor.
+        Loads stopwords, POS tagger and lemmatizer once.
+
+        :param stopwordPath: path of space-separated stopword file
+        :param cacheSize: maximum number of (word, pos) lemmas to memoize
+        """
+        self.stopwordPath = stopwordPath
+        self.cacheSize = cacheSize
+        self.executor = None
+        self.processes = 0
+
+        with open(stopwordPath, "r", encoding='utf8') as stop_file:
+            self.stopwords = frozenset(stop_file.read().split())
+
+        self.tagger = PerceptronTagger()
+        self.lemmatizer = WordNetLemmatizer()
+        self.lemma = lru_cache(maxsize=cacheSize)(self.lemmatizer.lemmatize)
+
+    def lemmatize(self, text: str) -> list:
+        """
+        Parses given article text, removing stopwords & lemmatizing words into base form.
+
+        :param text: Extracted full article text
+        :return: List of lemmatized words
+        """
+        # ``, '' included in stopwords
+        article_split = [
+            word for word in word_tokenize(text) if word.isalpha() and word.lower() not in self.stopwords]
+
+        article_lem = []
+        for (word, pos) in self.tagger.tag(article_split):
+            if pos[0] in "NVARS":  # N: noun, V: verb, A: adj, R: adv, S: satellite adj
+                if pos == "NNS":
+                    word, pos = word[:-1], 'NN'
+            elif pos[0] == "J":  # JJ - adj
+                pos = "ADJ"
+            elif pos[0] == "I":  # IN - ex. amid
+                pos = "R"
+            else:
+                continue
+            article_lem.append(self.lemma(word.lower(), pos[0].lower()))
+        return article_lem
+
+    def lemmatizeAll(self, texts: list) -> list:
+        """
+        Parses & lemmatizes a batch of article texts.
+
+        :param texts: List of extracted full article texts
+        :return: List of lemmatized word lists, in the same order
+        """
+        return [self.lemmatize(text) for text in texts]
+
+    @staticmethod
+    def frequency(article_lem: list) -> dict:
+        """
+        Finds document frequency for each word in lemmatized word list.
+
+        :param article_lem: Lemmatized article words list
+        :return: {word: frequency}, in order of first appearance
+        """
+        return dict(Counter(article_lem))
+
+    def frequencyAll(self, texts: list, processes: int = 1, chunksize: int = 16) -> list:
+        """
+        Lemmatizes a batch of article texts & counts each article's word frequencies, spread over a process pool.
+        The pool is kept between calls, so each worker loads its tagger & stopwords only once.
+
+        :param texts: List of extracted full article texts
+        :param processes: number of worker processes (1 runs in this process)
+        :param chunksize: number of articles sent to a worker at a time
+        :return: List of {word: frequency} dictionaries, in the same order
+        """
+        if processes <= 1:
+            return [self.frequency(article_lem) for article_lem in self.lemmatizeAll(texts)]
+
+        if self.executor is None or self.processes != processes:
+            self.close()
+            self.executor = ProcessPoolExecutor(
+                max_workers=processes, initializer=_initWorker, initargs=(self.stopwordPath, self.cacheSize))
+            self.processes = processes
+        return list(self.executor.map(_frequencyText, texts, chunksize=chunksize))
+
+    def close(self) -> None:
+        """
+        Shuts down worker processes, if any.
+
+        :return: None
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+            self.processes = 0
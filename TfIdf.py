@@ -0,0 +1,110 @@
+from Stock import Stock
+
+import sqlite3
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+class TfIdf:
+    """
+    TF-IDF engine that calculates keyword weights for all stocks at once using sparse matrices.
+    """
+
+    def __init__(self, cur: sqlite3.Cursor):
+        """
+        Class constructor.
+        Initializes instance variables for the term vocabulary and count matrices.
+
+        :param cur: cursor for SQL Database containing article tables (see TermStore.py)
+        """
+        self.cur = cur
+
+        self.terms = []  # [word1, word2, ...] indexed by Term_ID
+        self.termIdx = dict()  # {word: Term_ID}
+        self.docNum = 0
+        self.countMatrix = None  # sparse (stock x term) term frequency matrix
+        self.docFrequency = None  # [df1, df2, ...] per term
+
+    def calculate(self, stockList: list) -> None:
+        """
+        Calculates TF-IDF for all words in articles relating to each company (stock) in stockList, with term
+        frequencies summed over each stock's articles & document frequencies counted over all articles.
+        Saves TF-IDF values into each Stock object that has not been calculated yet.
+
+        :param stockList: list of Stock objects
+        :return: None
+        """
+        self.__buildMatrices(stockList)
+
+        # document frequency counts every article containing the exact term, not only the stock's own articles
+        idf = np.log10(self.docNum / (1 + self.docFrequency))
+        tf_idf = csr_matrix(self.countMatrix.multiply(idf[np.newaxis, :]))
+
+        for i in range(len(stockList)):
+            self.__saveStockTerms(stockList[i], tf_idf, i)
+
+    def __buildMatrices(self, stockList: list) -> None:
+        """
+        Sub method for self.calculate method.
+        Reads every article's postings once, building an (article x term) count matrix indexed by integer IDs.
+        Combines it with an (stock x article) membership matrix to form the (stock x term) count matrix,
+        and counts the number of articles containing each term to form the document frequency vector.
+
+        :param stockList: list of Stock objects
+        :return: None
+        """
+        stockIdx = {stockList[i].companyName: i for i in range(len(stockList))}
+
+        self.cur.execute("select Term_ID, Term from Terms;")
+        term_rows = self.cur.fetchall()
+        self.terms = [None] * (max([row[0] for row in term_rows], default=0) + 1)  # indexed by Term_ID
+        for (term_id, term) in term_rows:
+            self.terms[term_id] = term
+            self.termIdx[term] = term_id
+
+        self.cur.execute("select count(*), max(Article_Num) from Articles;")
+        (self.docNum, max_article) = self.cur.fetchone()
+
+        stock_rows, stock_arts = [], []
+        self.cur.execute("select Company, Article_Num from ArticleCompanies;")
+        for (name, article_num) in self.cur.fetchall():
+            if name in stockIdx:
+                stock_rows.append(stockIdx[name])
+                stock_arts.append(article_num)
+
+        self.cur.execute("select Article_Num, Term_ID, Frequency from Postings;")
+        postings = np.array(self.cur.fetchall(), dtype=np.int64).reshape(-1, 3)
+
+        article_cnt = (max_article or 0) + 1  # indexed by Article_Num
+        article_terms = csr_matrix(
+            (postings[:, 2].astype(np.float64), (postings[:, 0], postings[:, 1])),
+            shape=(article_cnt, len(self.terms)))
+        stock_articles = csr_matrix(
+            (np.ones(len(stock_rows), dtype=np.float64), (stock_rows, stock_arts)),
+            shape=(len(stockList), article_cnt))
+
+        article_terms.eliminate_zeros()
+        self.countMatrix = csr_matrix(stock_articles @ article_terms)
+        self.docFrequency = article_terms.getnnz(axis=0).astype(np.float64)
+
+    def __saveStockTerms(self, stock: Stock, tf_idf: csr_matrix, idx: int) -> bool:
+        """
+        Sub method for self.calculate method.
+        Saves TF-IDF values of given matrix row into Stock object, sorted by highest value.
+
+        :param stock: Stock object for company in question
+        :param tf_idf: sparse (stock x term) TF-IDF matrix
+        :param idx: row index of stock within tf_idf
+        :return: True if successfully saved TF-IDF, False if already calculated
+        """
+        if stock.calculated:
+            return False
+
+        start, end = tf_idf.indptr[idx], tf_idf.indptr[idx + 1]
+        cols = tf_idf.indices[start: end]
+        values = tf_idf.data[start: end]
+        order = np.argsort(-values, kind='stable')
+
+        stock.tf_idf = {self.terms[cols[k]]: float(values[k]) for k in order}
+        stock.calculated = True
+        return True
@@ -0,0 +1,123 @@
+from TermStore import TermStore
+
+import sys
+import sqlite3
+import numpy as np
+from hashlib import blake2b
+
+
+class VectorStore:
+    """
+    VectorStore class that serves word vectors from a compact memory-mapped file exported from a spaCy model.
+    Vectors are stored as a float32 (word x vector dimension) .npy file, indexed by a sorted array of word hashes.
+    """
+
+    def __init__(self, path: str = "WordVectors"):
+        """
+        Class constructor.
+        Memory-maps exported vector file, so every process using the same file shares one page-cached copy.
+
+        :param path: path prefix of exported vector files
+        """
+        try:
+            self.vectors = np.load(f"{path}.npy", mmap_mode='r')
+            self.keys = np.load(f"{path}_keys.npy")
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Word vector store '{path}' not found, export it first with: python VectorStore.py") from None
+        self.dim = self.vectors.shape[1]
+
+    @staticmethod
+    def wordHash(word: str) -> int:
+        """
+        Hashes word into a stable 64-bit key (Python's hash() is randomized per process).
+
+        :param word: given word
+        :return: 64-bit unsigned hash
+        """
+        return int.from_bytes(blake2b(word.encode('utf8'), digest_size=8).digest(), 'little')
+
+    def __find(self, word: str) -> int:
+        """
+        Helper method for self.hasVector() and self.getVector() methods.
+        Finds row of given word in vector file with binary search over sorted hash index.
+
+        :param word: given word
+        :return: row index, -1 if word has no vector
+        """
+        key = np.uint64(self.wordHash(word))
+        idx = int(np.searchsorted(self.keys, key))
+        if idx < len(self.keys) and self.keys[idx] == key:
+            return idx
+        return -1
+
+    def hasVector(self, word: str) -> bool:
+        """
+        Checks if given word has a word vector.
+
+        :param word: given word
+        :return: True if word vector exists, False otherwise
+        """
+        return self.__find(word) >= 0
+
+    def getVector(self, word: str) -> np.ndarray:
+        """
+        Retrieves word vector for given word.
+
+        :param word: given word
+        :return: float32 word vector, zero vector if word has no vector
+        """
+        idx = self.__find(word)
+        if idx < 0:
+            return np.zeros(self.dim, dtype=np.float32)
+        return np.asarray(self.vectors[idx])
+
+    @staticmethod
+    def databaseVocabulary(cur: sqlite3.Cursor) -> set:
+        """
+        Collects every word stored in the Terms table.
+
+        :param cur: cursor for SQL Database containing Terms table (see TermStore.py)
+        :return: set of words
+        """
+        cur.execute("select Term from Terms;")
+        return {row[0] for row in cur.fetchall()}
+
+    @staticmethod
+    def export(vocabulary, path: str = "WordVectors", model: str = 'en_core_web_lg') -> int:
+        """
+        Exports vectors of given vocabulary from spaCy model into vector store files.
+
+        :param vocabulary: iterable of words to export
+        :param path: path prefix of exported vector files
+        :param model: spaCy model name
+        :return: number of exported word vectors
+        """
+        import spacy
+
+        vocab = spacy.load(model).vocab
+        entries = dict()  # {hash: vector}
+        for word in vocabulary:
+            if vocab.has_vector(word):
+                entries[VectorStore.wordHash(word)] = vocab.get_vector(word)
+
+        keys = np.array(sorted(entries), dtype=np.uint64)
+        vectors = np.zeros((len(keys), vocab.vectors_length), dtype=np.float32)
+        for i in range(len(keys)):
+            vectors[i] = entries[int(keys[i])]
+
+        np.save(f"{path}.npy", vectors)
+        np.save(f"{path}_keys.npy", keys)
+        return len(keys)
+
+
+if __name__ == "__main__":
+    # usage: python VectorStore.py [database path] [vector store path prefix]
+    database = sys.argv[1] if len(sys.argv) > 1 else "StockDatabase.db"
+    output = sys.argv[2] if len(sys.argv) > 2 else "WordVectors"
+
+    conn = sqlite3.connect(database)
+    TermStore(conn)
+    cnt = VectorStore.export(VectorStore.databaseVocabulary(conn.cursor()), output)
+    conn.close()
+    print(f"Exported {cnt} word vectors to {output}.npy")